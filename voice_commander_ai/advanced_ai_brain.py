@@ -5,8 +5,15 @@ For more intelligent and context-aware responses
 
 import os
 import logging
-from typing import Optional
+import importlib.util
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import config
 from ai_brain import AIBrain
+from command_scorer import CommandScorer
+from conversation_history import ConversationHistory
+from response_streaming import stream_chat_completion
+from plugin_registry import LazyHandler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,17 +25,31 @@ class AdvancedAIBrain(AIBrain):
     def __init__(self, use_openai=False):
         super().__init__()
         self.use_openai = use_openai and self._check_openai_api()
-        self.conversation_history = []
+        self.conversation_history = ConversationHistory(
+            max_messages=config.HISTORY_MAX_MESSAGES,
+            max_tokens=config.HISTORY_MAX_TOKENS,
+        )
+        self._scorer = None
+        self._scorer_version = None
+        
+        self._openai = None
         
         if self.use_openai:
-            try:
-                import openai
-                self.openai = openai
-                self.openai.api_key = os.getenv("OPENAI_API_KEY")
-                logger.info("OpenAI integration enabled")
-            except ImportError:
+            # Only check that the library is there; it is imported on the first request
+            if importlib.util.find_spec('openai') is None:
                 logger.warning("OpenAI not installed. Install with: pip install openai")
                 self.use_openai = False
+            else:
+                logger.info("OpenAI integration enabled")
+    
+    @property
+    def openai(self):
+        """The openai module, imported on first use"""
+        if self._openai is None:
+            import openai
+            openai.api_key = os.getenv("OPENAI_API_KEY")
+            self._openai = openai
+        return self._openai
     
     def _check_openai_api(self) -> bool:
         """Check if OpenAI API key is configured"""
@@ -56,14 +77,13 @@ class AdvancedAIBrain(AIBrain):
     def _generate_openai_response(self, text: str) -> str:
         """Generate response using OpenAI GPT"""
         try:
-            # Add to conversation history
+            # Add to conversation history (bounded by count and token budget)
             self.conversation_history.append({
                 "role": "user",
                 "content": text
             })
             
-            # Keep only last 10 messages for context
-            messages = self.conversation_history[-10:]
+            messages = self.conversation_history.messages()
             
             # Call OpenAI API
             response = self.openai.ChatCompletion.create(
@@ -87,14 +107,80 @@ class AdvancedAIBrain(AIBrain):
             logger.error(f"OpenAI API error: {e}")
             return "I encountered an issue processing that. Please try again."
     
+    def process_command_stream(self, text: str) -> Iterator[str]:
+        """
+        Process a command, streaming the response as it is generated
+        
+        Command handlers answer in one piece; open-ended questions are
+        streamed from OpenAI when it is enabled.
+        
+        Args:
+            text: Voice command text
+            
+        Yields:
+            Response text fragments
+        """
+        if not text:
+            return
+        
+        command = self.match_command(text)
+        if command is not None:
+            yield self._call_handler(command, text)
+        else:
+            yield from self.generate_response_stream(text)
+    
+    def generate_response_stream(self, text: str) -> Iterator[str]:
+        """
+        Generate a response, yielding text fragments as they arrive
+        
+        Args:
+            text: User input text
+            
+        Yields:
+            Response text fragments
+        """
+        if not self.use_openai:
+            yield super().generate_response(text)
+            return
+        
+        self.conversation_history.append({
+            "role": "user",
+            "content": text
+        })
+        
+        parts = []
+        try:
+            for fragment in stream_chat_completion(
+                self.conversation_history.messages(),
+                api_key=os.getenv("OPENAI_API_KEY"),
+                temperature=0.7,
+                max_tokens=150
+            ):
+                parts.append(fragment)
+                yield fragment
+        except Exception as e:
+            logger.error(f"OpenAI streaming error: {e}")
+            if not parts:
+                yield "I encountered an issue processing that. Please try again."
+                return
+        
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": ''.join(parts)
+        })
+    
     def add_custom_command(self, keyword: str, handler):
         """
         Dynamically add custom commands
         
         Args:
             keyword: Command keyword to match
-            handler: Function to handle the command
+            handler: Function to handle the command, or a "module:attribute"
+                path that is only imported when the command is first used
         """
+        if isinstance(handler, str):
+            handler = LazyHandler(handler)
+        # The table's version changes, so the matcher is rebuilt on next use
         self.commands[keyword] = handler
         logger.info(f"Custom command '{keyword}' added")
     
@@ -117,6 +203,9 @@ class AdvancedAIBrain(AIBrain):
         """
         Calculate confidence score for command match
         
+        For registered commands the score is the best share of matching
+        tokens over the command keyword and its config synonyms.
+        
         Args:
             text: User input
             command: Command keyword
@@ -124,10 +213,46 @@ class AdvancedAIBrain(AIBrain):
         Returns:
             Confidence score (0.0 to 1.0)
         """
-        # Simple similarity calculation
+        if command in self.commands:
+            return self._get_scorer().score(text, command)
+        
+        # Simple similarity calculation for unregistered phrases
         matches = sum(1 for word in command.split() if word in text)
         total_words = len(command.split())
         return matches / total_words if total_words > 0 else 0.0
+    
+    def rank_commands(self, text: str, k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Score the text against every command in one pass
+        
+        Args:
+            text: User input
+            k: Number of candidates to return
+            
+        Returns:
+            List of (command, confidence), best first
+        """
+        return self._get_scorer().top_k(text, k)
+    
+    def rank_commands_many(self, texts: Iterable[str], k: int = 3) -> Iterator[List[Tuple[str, float]]]:
+        """
+        Score many texts against every command, one matrix product per chunk
+        
+        Args:
+            texts: Iterable of user inputs
+            k: Number of candidates per text
+            
+        Yields:
+            List of (command, confidence) per text, best first
+        """
+        return self._get_scorer().top_k_many(texts, k)
+    
+    def _get_scorer(self) -> CommandScorer:
+        """Return the confidence scorer, rebuilding it if the table changed"""
+        if self._scorer is None or self._scorer_version != self.commands.version:
+            self._scorer = CommandScorer(self.commands.keys(), config.VOICE_COMMANDS)
+            self._scorer_version = self.commands.version
+        return self._scorer
 
 
 # Example usage
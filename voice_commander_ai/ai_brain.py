@@ -7,7 +7,15 @@ import os
 import datetime
 import subprocess
 import logging
-from typing import Optional
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Tuple
+
+import config
+from command_matcher import CommandMatcher, CommandTable
+from safe_calculator import CalculationError, CalculationTooExpensive, SafeCalculator, format_number
+from series_calculator import SeriesCalculator
+from response_cache import ResponseCache, day_bucket, minute_bucket, pure, time_bucketed
+from tracing import span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,9 +24,24 @@ logger = logging.getLogger(__name__)
 class AIBrain:
     """Core AI logic for processing commands"""
     
+    GREETINGS = [
+        "Hello! How can I assist you?",
+        "Hi there! What can I do for you?",
+        "Hey! Ready to help. What do you need?",
+    ]
+    
     def __init__(self):
         self.user_name = "User"
-        self.commands = self._build_command_dictionary()
+        self.commands = CommandTable(self._build_command_dictionary())
+        self._matcher = None
+        self._matcher_version = None
+        self.calculator = SafeCalculator()
+        self.series_calculator = SeriesCalculator()
+        self._cache_policies = self._build_cache_policies()
+        # A policy describes the built-in handler it was written for, not
+        # whatever is later registered under the same keyword
+        self._policy_handlers = {command: self.commands[command] for command in self._cache_policies}
+        self.response_cache = ResponseCache(dict(self._cache_policies), config.RESPONSE_CACHE_SIZE)
     
     def _build_command_dictionary(self):
         """Build a dictionary of voice commands"""
@@ -34,6 +57,15 @@ class AIBrain:
             'bye': self.goodbye,
         }
     
+    def _build_cache_policies(self):
+        """Build the caching policy for each deterministic handler"""
+        return {
+            'time': time_bucketed(minute_bucket),
+            'date': time_bucketed(day_bucket),
+            'help': pure(),
+            'bye': pure(),
+        }
+    
     def process_command(self, text: str) -> Optional[str]:
         """
         Process voice command and return response
@@ -47,14 +79,100 @@ class AIBrain:
         if not text:
             return None
         
-        # Check for exact command matches
-        for command, handler in self.commands.items():
-            if command in text:
-                return handler(text)
+        with span('match'):
+            command = self.match_command(text)
+        if command is not None:
+            with span('handler', command=command):
+                return self._call_handler(command, text)
         
         # If no command found, generate generic response
         return self.generate_response(text)
     
+    def process_commands(self, texts: Iterable[str], chunk_size: int = 1000) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Process many commands, e.g. when replaying logged transcripts
+        
+        Texts are consumed lazily in chunks. Inside a chunk they are
+        normalized, routed and grouped by handler before the handlers run,
+        so large corpora can be streamed without loading them into memory.
+        
+        Args:
+            texts: Iterable or generator of voice command texts
+            chunk_size: Number of texts routed together
+            
+        Yields:
+            (text, handler, response) tuples in input order; handler is the
+            command keyword or None for the generic response
+        """
+        iterator = iter(texts)
+        
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            matcher = self._get_matcher()
+            
+            # Route each text and group the chunk by handler
+            groups = {}
+            routes = []
+            for index, text in enumerate(chunk):
+                normalized = text.strip().lower() if text else ""
+                command = matcher.best(normalized) if normalized else None
+                routes.append((normalized, command))
+                if normalized:
+                    groups.setdefault(command, []).append(index)
+            
+            # Handlers get the original text, as in process_command
+            responses = [None] * len(chunk)
+            for command, indexes in groups.items():
+                for index in indexes:
+                    if command is None:
+                        responses[index] = self.generate_response(chunk[index])
+                    else:
+                        responses[index] = self._call_handler(command, chunk[index])
+            
+            for text, (_, command), response in zip(chunk, routes, responses):
+                yield text, command, response
+    
+    def _call_handler(self, command: str, text: str) -> str:
+        """Run a command handler through the response cache"""
+        return self.response_cache.call(command, self.commands[command], text)
+    
+    def cache_stats(self) -> dict:
+        """Get response cache hit/miss statistics"""
+        return self.response_cache.stats()
+    
+    def match_command(self, text: str) -> Optional[str]:
+        """
+        Find the best command keyword for the text
+        
+        Args:
+            text: Voice command text
+            
+        Returns:
+            Command keyword or None if nothing matched
+        """
+        return self._get_matcher().best(text)
+    
+    def _get_matcher(self) -> CommandMatcher:
+        """Return the command matcher, rebuilding it if the table changed"""
+        if self._matcher is None or self._matcher_version != self.commands.version:
+            self._rebuild_matcher()
+        return self._matcher
+    
+    def _rebuild_matcher(self):
+        """Compile the command table and config synonyms into a matcher"""
+        self._matcher = CommandMatcher(self.commands.keys(), config.VOICE_COMMANDS)
+        self._matcher_version = self.commands.version
+        # Handlers may have been replaced, so cached responses are stale and
+        # only keywords still bound to their built-in handler keep a policy
+        self.response_cache.clear()
+        self.response_cache.policies = {
+            command: policy for command, policy in self._cache_policies.items()
+            if self.commands.get(command) == self._policy_handlers[command]
+        }
+    
     def get_time(self, command: str) -> str:
         """Get current time"""
         current_time = datetime.datetime.now().strftime("%I:%M %p")
@@ -107,23 +225,22 @@ class AIBrain:
     
     def simple_calculate(self, command: str) -> str:
         """Simple calculator functionality"""
+        math_expr = command.replace('calculate', '').replace('what is', '').replace('solve', '').strip()
         try:
-            # Extract numbers and operators
-            math_expr = command.replace('calculate', '').replace('what is', '').strip()
-            result = eval(math_expr)
-            return f"The answer is {result}"
-        except Exception as e:
+            # Series like "sum of numbers from 1 to 100" use closed forms
+            result = self.series_calculator.evaluate(math_expr)
+            if result is None:
+                result = self.calculator.evaluate(math_expr)
+            return f"The answer is {format_number(result)}"
+        except CalculationTooExpensive:
+            return "That calculation is too large for me"
+        except CalculationError:
             return "Could not calculate that expression"
     
     def greet(self, command: str) -> str:
         """Greet the user"""
-        greetings = [
-            "Hello! How can I assist you?",
-            "Hi there! What can I do for you?",
-            "Hey! Ready to help. What do you need?",
-        ]
         import random
-        return random.choice(greetings)
+        return random.choice(self.GREETINGS)
     
     def show_help(self, command: str) -> str:
         """Show available commands"""
@@ -4,14 +4,35 @@ Optional integrations for enhanced functionality
 """
 
 import os
-import requests
+import re
 import logging
-from typing import Optional, Dict
+from itertools import islice
+from typing import Optional, Dict, Iterable, Iterator, Tuple
+
+from http_session import PooledSession, shared_session
+from plugin_registry import PluginRegistry
+from response_streaming import stream_chat_completion
+from tracing import span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def remove_words(text: str, *words: str) -> str:
+    """
+    Remove command keywords from spoken text, whatever their case
+    
+    Args:
+        text: Command text
+        words: Whole words to remove
+    
+    Returns:
+        The remaining text with whitespace collapsed
+    """
+    pattern = r'\b(?:' + '|'.join(map(re.escape, words)) + r')\b'
+    return ' '.join(re.sub(pattern, ' ', text, flags=re.IGNORECASE).split())
+
+
 # ==========================================
 # OPENWEATHER API - Weather Integration
 # ==========================================
@@ -19,12 +40,13 @@ logger = logging.getLogger(__name__)
 class WeatherIntegration:
     """Get weather information from OpenWeatherMap API"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[PooledSession] = None):
         """
         Initialize Weather API
         Get API key from: https://openweathermap.org/api
         """
         self.api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
+        self.http = session or shared_session()
         self.base_url = "https://api.openweathermap.org/data/2.5/weather"
     
     def get_weather(self, city: str) -> str:
@@ -39,7 +61,7 @@ class WeatherIntegration:
                 'units': 'metric'  # Use Celsius
             }
             
-            response = requests.get(self.base_url, params=params)
+            response = self.http.get(self.base_url, params=params)
             data = response.json()
             
             if response.status_code == 200:
@@ -70,12 +92,13 @@ class WeatherIntegration:
 class NewsIntegration:
     """Get latest news from NewsAPI"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[PooledSession] = None):
         """
         Initialize News API
         Get API key from: https://newsapi.org
         """
         self.api_key = api_key or os.getenv("NEWSAPI_KEY")
+        self.http = session or shared_session()
         self.base_url = "https://newsapi.org/v2/top-headlines"
     
     def get_top_headlines(self, country: str = "us", count: int = 3) -> str:
@@ -90,7 +113,7 @@ class NewsIntegration:
                 'pageSize': count
             }
             
-            response = requests.get(self.base_url, params=params)
+            response = self.http.get(self.base_url, params=params)
             data = response.json()
             
             if data['status'] == 'ok':
@@ -158,6 +181,27 @@ class OpenAIIntegration:
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             return "Error getting AI response"
+    
+    def get_response_stream(self, prompt: str, max_tokens: int = 150) -> Iterator[str]:
+        """Stream AI response from GPT, yielding text as it is generated"""
+        if not self.available:
+            yield "OpenAI integration not available"
+            return
+        
+        messages = [
+            {"role": "system", "content": "You are a helpful voice assistant."},
+            {"role": "user", "content": prompt}
+        ]
+        started = False
+        try:
+            for fragment in stream_chat_completion(messages, api_key=self.api_key,
+                                                   max_tokens=max_tokens, temperature=0.7):
+                started = True
+                yield fragment
+        except Exception as e:
+            logger.error(f"OpenAI streaming error: {e}")
+            if not started:
+                yield "Error getting AI response"
 
 
 # ==========================================
@@ -206,12 +250,13 @@ class WikipediaIntegration:
 class GoogleMapsIntegration:
     """Get location and direction information"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[PooledSession] = None):
         """
         Initialize Google Maps API
         Get API key from: https://cloud.google.com/maps-platform
         """
         self.api_key = api_key or os.getenv("GOOGLE_MAPS_API_KEY")
+        self.http = session or shared_session()
     
     def get_distance(self, origin: str, destination: str) -> str:
         """Get distance between two locations"""
@@ -226,7 +271,7 @@ class GoogleMapsIntegration:
                 'key': self.api_key
             }
             
-            response = requests.get(url, params=params)
+            response = self.http.get(url, params=params)
             data = response.json()
             
             if data['status'] == 'OK':
@@ -287,43 +332,117 @@ class StockIntegration:
 class IntegratedVoiceAI:
     """Voice AI with all integrations"""
     
-    def __init__(self):
-        """Initialize all integrations"""
-        self.weather = WeatherIntegration()
-        self.news = NewsIntegration()
-        self.openai = OpenAIIntegration()
-        self.wikipedia = WikipediaIntegration()
-        self.maps = GoogleMapsIntegration()
-        self.stock = StockIntegration()
+    def __init__(self, discover_plugins: bool = True):
+        """
+        Register all integrations
+        
+        Integrations are only imported and constructed when a command
+        first needs them.
+        
+        Args:
+            discover_plugins: Also register plugins from package entry points
+        """
+        self.registry = PluginRegistry()
+        self.registry.register('weather', ['weather'], 'api_integrations:WeatherIntegration')
+        self.registry.register('news', ['news'], 'api_integrations:NewsIntegration')
+        self.registry.register('wikipedia', ['wikipedia', 'search'], 'api_integrations:WikipediaIntegration')
+        self.registry.register('stock', ['stock', 'price'], 'api_integrations:StockIntegration')
+        self.registry.register('maps', ['distance'], 'api_integrations:GoogleMapsIntegration')
+        self.registry.register('openai', [], 'api_integrations:OpenAIIntegration')
+        
+        if discover_plugins:
+            self.registry.discover()
+    
+    weather = property(lambda self: self.registry.get('weather'))
+    news = property(lambda self: self.registry.get('news'))
+    openai = property(lambda self: self.registry.get('openai'))
+    wikipedia = property(lambda self: self.registry.get('wikipedia'))
+    maps = property(lambda self: self.registry.get('maps'))
+    stock = property(lambda self: self.registry.get('stock'))
     
     def handle_command(self, command: str) -> str:
         """Route command to appropriate integration"""
+        integration = self.route_command(command)
+        if integration is None:
+            return None
+        with span('integration', integration=integration):
+            return self._run_integration(integration, command)
+    
+    def handle_commands(self, commands: Iterable[str], chunk_size: int = 1000) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Handle many commands, e.g. when replaying logged transcripts
+        
+        Commands are consumed lazily in chunks, normalized, routed and
+        grouped by integration before any integration is called.
+        
+        Args:
+            commands: Iterable or generator of command texts
+            chunk_size: Number of commands routed together
+            
+        Yields:
+            (text, integration, response) tuples in input order; integration
+            is None when no integration handles the command
+        """
+        iterator = iter(commands)
         
-        if 'weather' in command:
-            city = command.replace('weather', '').replace('in', '').strip()
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            normalized = [text.strip().lower() if text else "" for text in chunk]
+            routes = [self.route_command(text) if text else None for text in normalized]
+            
+            groups = {}
+            for index, integration in enumerate(routes):
+                if integration is not None:
+                    groups.setdefault(integration, []).append(index)
+            
+            responses = [None] * len(chunk)
+            for integration, indexes in groups.items():
+                for index in indexes:
+                    # Integrations get the original text, as in handle_command
+                    responses[index] = self._run_integration(integration, chunk[index])
+            
+            for text, integration, response in zip(chunk, routes, responses):
+                yield text, integration, response
+    
+    def connection_stats(self) -> dict:
+        """Connection reuse statistics of the shared HTTP session"""
+        return shared_session().stats()
+    
+    def route_command(self, command: str) -> Optional[str]:
+        """Pick the integration name for a command, or None"""
+        return self.registry.match(command)
+    
+    def _run_integration(self, integration: str, command: str) -> str:
+        """Run a routed command against its integration"""
+        if integration == 'weather':
+            city = remove_words(command, 'weather', 'in')
             return self.weather.get_weather(city) if city else "Which city?"
         
-        elif 'news' in command:
+        elif integration == 'news':
             return self.news.get_top_headlines()
         
-        elif 'wikipedia' in command or 'search' in command:
-            query = command.replace('wikipedia', '').replace('search', '').strip()
+        elif integration == 'wikipedia':
+            query = remove_words(command, 'wikipedia', 'search')
             return self.wikipedia.search(query) if query else "What do you want to search?"
         
-        elif 'stock' in command or 'price' in command:
-            symbol = command.replace('stock', '').replace('price', '').strip().upper()
+        elif integration == 'stock':
+            symbol = remove_words(command, 'stock', 'price').upper()
             return self.stock.get_stock_price(symbol) if symbol else "Which stock?"
         
-        elif 'distance' in command:
+        elif integration == 'maps':
             # Parse "distance from A to B"
-            parts = command.split('to')
+            parts = re.split(r'\bto\b', command, flags=re.IGNORECASE)
             if len(parts) == 2:
-                origin = parts[0].replace('distance from', '').strip()
+                origin = remove_words(parts[0], 'distance', 'from')
                 destination = parts[1].strip()
                 return self.maps.get_distance(origin, destination)
             return "Please say: distance from [place] to [place]"
         
-        return None
+        # Plugins from entry points handle their own commands
+        return self.registry.get(integration).handle_command(command)
 
 
 # ==========================================
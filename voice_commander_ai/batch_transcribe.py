@@ -0,0 +1,236 @@
+"""
+Batch Transcription Module
+Transcribes directories or manifests of recorded audio into JSONL
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.aiff', '.aif')
+
+# Results that are final; files that failed with an error are retried on resume
+DONE_STATUSES = {'ok', 'no_speech'}
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def iter_audio_files(source: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    List the audio files to transcribe
+    
+    The source is either a directory (searched recursively) or a manifest:
+    a text file with one path per line, or a JSONL file whose lines have a
+    "path" and optionally the reference "text". Relative manifest paths are
+    resolved against the manifest's directory.
+    
+    Args:
+        source: Directory or manifest path
+    
+    Yields:
+        (audio path, reference transcript or None)
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(AUDIO_EXTENSIONS):
+                    yield os.path.join(root, name), None
+        return
+    
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            reference = None
+            if line.startswith('{'):
+                entry = json.loads(line)
+                path, reference = entry['path'], entry.get('text')
+            else:
+                path = line
+            yield os.path.join(base, path), reference
+
+
+def load_completed(output_path: str) -> Set[str]:
+    """
+    Paths already transcribed in an existing output file
+    
+    Args:
+        output_path: JSONL results file
+    
+    Returns:
+        Set of audio paths with a final result
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            if result.get('status') in DONE_STATUSES:
+                done.add(result['path'])
+    return done
+
+
+def _init_worker(backend_name: Optional[str]):
+    """Create and load the speech backend once per worker process"""
+    import speech_recognition as sr
+    from speech_backends import create_backend
+    
+    logging.getLogger().setLevel(logging.WARNING)
+    backend = create_backend(backend_name)
+    backend.load()
+    _worker['sr'] = sr
+    _worker['recognizer'] = sr.Recognizer()
+    _worker['backend'] = backend
+
+
+def _transcribe(path: str) -> Dict:
+    """Transcribe one file in a worker process"""
+    sr = _worker['sr']
+    recognizer = _worker['recognizer']
+    result = {'path': path}
+    
+    t0 = time.perf_counter()
+    try:
+        with sr.AudioFile(path) as source:
+            audio = recognizer.record(source)
+    except (OSError, ValueError, EOFError) as e:
+        result.update(status='error', error=f"unreadable audio: {e}")
+        return result
+    t1 = time.perf_counter()
+    result['audio_seconds'] = round(len(audio.frame_data) / (audio.sample_rate * audio.sample_width), 3)
+    result['read_ms'] = round((t1 - t0) * 1000, 2)
+    
+    try:
+        result['text'] = _worker['backend'].recognize(recognizer, audio).lower()
+        result['status'] = 'ok'
+    except sr.UnknownValueError:
+        result['text'] = ''
+        result['status'] = 'no_speech'
+    except Exception as e:
+        # RequestError, or anything else the engine raises: one bad file
+        # must not abort the whole batch
+        result['status'] = 'error'
+        result['error'] = str(e) or type(e).__name__
+    result['recognize_ms'] = round((time.perf_counter() - t1) * 1000, 2)
+    return result
+
+
+def transcribe_batch(files: Iterable[Tuple[str, Optional[str]]], output_path: str,
+                     backend: Optional[str] = None, workers: Optional[int] = None,
+                     resume: bool = True) -> Dict:
+    """
+    Transcribe audio files across a process pool into a JSONL file
+    
+    At most twice as many files as workers are in flight at once, so huge
+    manifests are streamed rather than queued up front. Each result is
+    appended and flushed as soon as it completes, which makes an
+    interrupted run resumable.
+    
+    Args:
+        files: (path, reference transcript) pairs, e.g. from iter_audio_files()
+        output_path: JSONL file results are appended to
+        backend: Speech backend name (default: config.STT_BACKEND)
+        workers: Worker processes (default: config.BATCH_WORKERS or CPU count)
+        resume: Skip files that already have a final result in output_path
+    
+    Returns:
+        Summary counts and timing
+    
+    Raises:
+        ValueError: Unknown backend name
+        sr.RequestError: The backend could not be loaded
+    """
+    from speech_backends import create_backend
+    
+    # Load the backend here first: a missing module or model then fails
+    # once with its own message, rather than as a BrokenProcessPool when
+    # every worker's initializer raises it
+    create_backend(backend).load()
+    
+    workers = workers or config.BATCH_WORKERS or os.cpu_count() or 1
+    done = load_completed(output_path) if resume else set()
+    summary = {'transcribed': 0, 'no_speech': 0, 'errors': 0, 'skipped': 0}
+    start = time.perf_counter()
+    
+    with open(output_path, 'a' if resume else 'w') as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(backend,)) as pool:
+        pending = {}
+        
+        def drain():
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                reference = pending.pop(future)
+                result = future.result()
+                if reference is not None:
+                    result['reference'] = reference
+                out.write(json.dumps(result) + '\n')
+                out.flush()
+                if result['status'] == 'ok':
+                    summary['transcribed'] += 1
+                elif result['status'] == 'no_speech':
+                    summary['no_speech'] += 1
+                else:
+                    summary['errors'] += 1
+                    logger.warning(f"{result['path']}: {result.get('error')}")
+        
+        for path, reference in files:
+            if path in done:
+                summary['skipped'] += 1
+                continue
+            if len(pending) >= workers * 2:
+                drain()
+            pending[pool.submit(_transcribe, path)] = reference
+        while pending:
+            drain()
+    
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Transcribe recorded audio files to JSONL")
+    parser.add_argument('source', help="directory of audio files, or a manifest (.txt paths or .jsonl)")
+    parser.add_argument('-o', '--output', default='transcripts.jsonl', help="JSONL output file")
+    parser.add_argument('--backend', help=f"speech backend (default: {config.STT_BACKEND})")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--restart', action='store_true',
+                        help="overwrite the output instead of resuming")
+    args = parser.parse_args(argv)
+    
+    import speech_recognition as sr
+    try:
+        summary = transcribe_batch(iter_audio_files(args.source), args.output,
+                                   backend=args.backend, workers=args.workers,
+                                   resume=not args.restart)
+    except sr.RequestError as e:
+        print(f"❌ Cannot load the speech backend: {e}", file=sys.stderr)
+        return 2
+    print(f"✅ {summary['transcribed']} transcribed, {summary['no_speech']} without speech, "
+          f"{summary['errors']} failed, {summary['skipped']} already done "
+          f"in {summary['seconds']:.1f}s -> {args.output}")
+    return 0 if summary['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,495 @@
+"""
+Benchmark script for Voice Commander AI
+Measures the command routing and response hot paths on synthetic utterances
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import random
+import argparse
+import logging
+
+import config
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Commands with side effects (launching apps, opening the browser) are never benchmarked
+SIDE_EFFECT_COMMANDS = {'open', 'search'}
+
+FILLER_WORDS = [
+    'please', 'can', 'you', 'tell', 'me', 'the', 'now', 'quickly', 'hey',
+    'assistant', 'maybe', 'i', 'want', 'to', 'know', 'about', 'this',
+]
+
+INTEGRATION_PHRASES = [
+    'weather in paris', 'weather in london', 'news', 'latest news today',
+    'distance from berlin to munich', 'distance from here',
+]
+
+
+def build_corpus(size: int, seed: int = 42) -> list:
+    """
+    Build a synthetic utterance corpus from the configured voice commands
+    
+    Args:
+        size: Number of utterances
+        seed: Random seed for reproducible corpora
+    
+    Returns:
+        List of utterance strings
+    """
+    rng = random.Random(seed)
+    phrases = [
+        phrase
+        for command, synonyms in config.VOICE_COMMANDS.items()
+        if command not in SIDE_EFFECT_COMMANDS
+        for phrase in synonyms
+        if not any(phrase in config.VOICE_COMMANDS[other] for other in SIDE_EFFECT_COMMANDS)
+    ]
+    phrases.append('calculate 12 times 7')
+    phrases.append('sum of numbers from 1 to ten million')
+    
+    corpus = []
+    for _ in range(size):
+        words = rng.sample(FILLER_WORDS, rng.randint(0, 4))
+        if rng.random() < 0.8:
+            words.insert(rng.randint(0, len(words)), rng.choice(phrases))
+        corpus.append(' '.join(words) or 'hello')
+    return corpus
+
+
+def measure(name: str, func, inputs: list) -> dict:
+    """
+    Time func over every input
+    
+    Args:
+        name: Benchmark name
+        func: Callable taking one input
+        inputs: Inputs to feed
+    
+    Returns:
+        Result dictionary with ops/sec and latency percentiles
+    """
+    latencies = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for item in inputs:
+        t0 = clock()
+        func(item)
+        latencies.append(clock() - t0)
+    elapsed = (clock() - start) / 1e9
+    
+    latencies.sort()
+    
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] / 1e3
+    
+    return {
+        'name': name,
+        'count': len(inputs),
+        'ops_per_sec': len(inputs) / elapsed if elapsed else 0.0,
+        'p50_us': percentile(50),
+        'p99_us': percentile(99),
+        'max_us': latencies[-1] / 1e3,
+    }
+
+
+def bench_process_command(corpus, custom_commands):
+    """AIBrain.process_command over the corpus"""
+    from advanced_ai_brain import AdvancedAIBrain
+    
+    brain = AdvancedAIBrain(use_openai=False)
+    for i in range(custom_commands):
+        brain.add_custom_command(f"custom action {i}", lambda text: "ok")
+    return measure('AIBrain.process_command', brain.process_command, corpus)
+
+
+def bench_command_confidence(corpus, custom_commands):
+    """AdvancedAIBrain.get_command_confidence against every command"""
+    from advanced_ai_brain import AdvancedAIBrain
+    
+    brain = AdvancedAIBrain(use_openai=False)
+    for i in range(custom_commands):
+        brain.add_custom_command(f"custom action {i}", lambda text: "ok")
+    commands = list(brain.commands)
+    
+    def score_all(text):
+        return [brain.get_command_confidence(text, command) for command in commands]
+    
+    return measure('AdvancedAIBrain.get_command_confidence (all commands)', score_all, corpus)
+
+
+def bench_rank_commands(corpus, custom_commands):
+    """AdvancedAIBrain.rank_commands (vectorized top-k scoring)"""
+    from advanced_ai_brain import AdvancedAIBrain
+    
+    brain = AdvancedAIBrain(use_openai=False)
+    for i in range(custom_commands):
+        brain.add_custom_command(f"custom action {i}", lambda text: "ok")
+    return measure('AdvancedAIBrain.rank_commands', brain.rank_commands, corpus)
+
+
+def bench_detect_intent(corpus, custom_commands):
+    """AdvancedVoiceAI.detect_intent over the corpus"""
+    from examples_and_extensions import AdvancedVoiceAI
+    from intent_classifier import IntentClassifier
+    
+    # Skip __init__: intent detection needs no microphone or speech engine
+    ai = AdvancedVoiceAI.__new__(AdvancedVoiceAI)
+    ai.intents = IntentClassifier()
+    return measure('AdvancedVoiceAI.detect_intent', ai.detect_intent, corpus)
+
+
+def bench_handle_command(corpus, custom_commands):
+    """IntegratedVoiceAI.handle_command with API keys cleared (no network)"""
+    from api_integrations import IntegratedVoiceAI
+    
+    ai = IntegratedVoiceAI(discover_plugins=False)
+    ai.weather.api_key = None
+    ai.news.api_key = None
+    ai.maps.api_key = None
+    
+    rng = random.Random(len(corpus))
+    inputs = [
+        rng.choice(INTEGRATION_PHRASES) if rng.random() < 0.5 else text
+        for text in corpus
+    ]
+    # Wikipedia and stock lookups have no key to clear, so keep them out
+    inputs = [text for text in inputs if ai.route_command(text) not in ('wikipedia', 'stock')]
+    return measure('IntegratedVoiceAI.handle_command', ai.handle_command, inputs)
+
+
+def load_speech_fixtures(directory: str) -> list:
+    """
+    Load recorded WAV fixtures with their reference transcripts
+    
+    Each <name>.wav may have a <name>.txt next to it holding what was said;
+    fixtures without one are timed but not scored.
+    
+    Args:
+        directory: Directory of WAV files
+    
+    Returns:
+        List of (name, AudioData, transcript or None)
+    """
+    import speech_recognition as sr
+    
+    recognizer = sr.Recognizer()
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.wav'))):
+        with sr.AudioFile(path) as source:
+            audio = recognizer.record(source)
+        transcript_path = os.path.splitext(path)[0] + '.txt'
+        transcript = None
+        if os.path.exists(transcript_path):
+            with open(transcript_path) as f:
+                transcript = f.read().strip()
+        fixtures.append((os.path.basename(path), audio, transcript))
+    return fixtures
+
+
+def bench_speech_backend(name: str, fixtures: list) -> dict:
+    """
+    Recognition latency and word error rate of one speech backend
+    
+    Args:
+        name: Backend name from speech_backends.BACKENDS
+        fixtures: Output of load_speech_fixtures()
+    
+    Returns:
+        Result dictionary (latency plus 'wer' and 'errors')
+    """
+    import speech_recognition as sr
+    from speech_backends import create_backend, word_error_rate
+    
+    backend = create_backend(name)
+    recognizer = sr.Recognizer()
+    load_start = time.perf_counter()
+    backend.load()
+    load_seconds = time.perf_counter() - load_start
+    
+    transcripts = {}
+    errors = 0
+    
+    def recognize(fixture):
+        nonlocal errors
+        try:
+            transcripts[fixture[0]] = backend.recognize(recognizer, fixture[1])
+        except (sr.UnknownValueError, sr.RequestError):
+            transcripts[fixture[0]] = ''
+            errors += 1
+    
+    result = measure(f"speech backend: {name}", recognize, fixtures)
+    scored = [(transcripts[fname], reference) for fname, _, reference in fixtures if reference is not None]
+    result['load_seconds'] = load_seconds
+    result['errors'] = errors
+    result['wer'] = (
+        sum(word_error_rate(reference, text) for text, reference in scored) / len(scored)
+        if scored else None
+    )
+    return result
+
+
+def bench_cloud_payload(fixtures: list) -> list:
+    """
+    Google request size and latency with native-rate versus 16 kHz audio
+    
+    Args:
+        fixtures: Output of load_speech_fixtures()
+    
+    Returns:
+        One result per payload format ('avg_bytes' plus latency; failed
+        requests, e.g. when offline, are counted in 'errors')
+    """
+    import speech_recognition as sr
+    from speech_backends import GoogleBackend, resample_for_cloud
+    
+    recognizer = sr.Recognizer()
+    results = []
+    for label, resample in (('native rate', False), (f"{config.CLOUD_SAMPLE_RATE} Hz", True)):
+        backend = GoogleBackend(language=config.STT_LANGUAGE, resample=resample)
+        payload_bytes = []
+        errors = 0
+        
+        def recognize(fixture):
+            nonlocal errors
+            audio = resample_for_cloud(fixture[1]) if resample else fixture[1]
+            payload_bytes.append(len(audio.get_flac_data()))
+            try:
+                backend.recognize(recognizer, fixture[1])
+            except (sr.UnknownValueError, sr.RequestError):
+                errors += 1
+        
+        result = measure(f"google payload: {label}", recognize, fixtures)
+        result['avg_bytes'] = sum(payload_bytes) / len(payload_bytes)
+        result['errors'] = errors
+        results.append(result)
+    return results
+
+
+def run_speech_benchmarks(directory: str, backends=None, payload=False) -> list:
+    """
+    Compare speech backends on recorded WAV fixtures
+    
+    Args:
+        directory: Fixture directory (see load_speech_fixtures)
+        backends: Backend names (default: all)
+        payload: Also compare Google upload sizes at native and 16 kHz rates
+    
+    Returns:
+        List of result dictionaries
+    """
+    from speech_backends import BACKENDS
+    
+    fixtures = load_speech_fixtures(directory)
+    if not fixtures:
+        logger.warning(f"No WAV fixtures found in {directory}")
+        return []
+    
+    results = []
+    for name in backends or BACKENDS:
+        try:
+            results.append(bench_speech_backend(name, fixtures))
+        except Exception as e:
+            logger.warning(f"Skipping speech backend {name}: {e}")
+            results.append({'name': f"speech backend: {name}", 'skipped': str(e)})
+    if payload:
+        results.extend(bench_cloud_payload(fixtures))
+    return results
+
+
+# Simulated stage costs for the pipeline benchmark (seconds)
+PIPELINE_RECOGNIZE_SECONDS = 0.02
+PIPELINE_SPEAK_SECONDS = 0.03
+PIPELINE_UTTERANCES = 100
+
+
+def bench_pipeline(corpus, custom_commands):
+    """
+    Serial loop versus the asyncio pipeline on queued utterances
+    
+    Recognition and speech are simulated with fixed delays; routing is
+    the real AdvancedAIBrain.process_command. All utterances are waiting at the
+    start, and in both modes latency runs from that start to when the
+    response starts playing, so it includes time spent queued behind
+    earlier ones (the pipeline's own capture-to-speech latencies start
+    later, when capture takes an utterance).
+    """
+    import asyncio
+    from advanced_ai_brain import AdvancedAIBrain
+    from pipeline import END, PipelineStats, VoicePipeline
+    
+    brain = AdvancedAIBrain(use_openai=False)
+    for i in range(custom_commands):
+        brain.add_custom_command(f"custom action {i}", lambda text: "ok")
+    utterances = corpus[:PIPELINE_UTTERANCES]
+    
+    def recognize(text):
+        time.sleep(PIPELINE_RECOGNIZE_SECONDS)
+        return text
+    
+    def speak(response):
+        time.sleep(PIPELINE_SPEAK_SECONDS)
+    
+    def as_result(name, stats, latencies):
+        latencies = sorted(latencies)
+        
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1e6
+        
+        return {
+            'name': name,
+            'count': stats.captured,
+            'ops_per_sec': stats.summary()['utterances_per_sec'],
+            'p50_us': percentile(50),
+            'p99_us': percentile(99),
+            'max_us': latencies[-1] * 1e6,
+        }
+    
+    serial = PipelineStats()
+    serial_latencies = []
+    for text in utterances:
+        serial.captured += 1
+        response = brain.process_command(recognize(text))
+        if response:
+            serial_latencies.append(time.perf_counter() - serial.started)
+            serial.responses += 1
+            speak(response)
+    serial.finished = time.perf_counter()
+    
+    pending = iter(utterances)
+    pipeline_latencies = []
+    arrived = time.perf_counter()
+    
+    def speak_pipelined(response):
+        pipeline_latencies.append(time.perf_counter() - arrived)
+        speak(response)
+    
+    pipeline = VoicePipeline(lambda: next(pending, END), recognize, brain.process_command, speak_pipelined)
+    pipelined = asyncio.run(pipeline.run())
+    
+    return [as_result('pipeline: serial loop', serial, serial_latencies),
+            as_result('pipeline: asyncio stages', pipelined, pipeline_latencies)]
+
+
+BENCHMARKS = {
+    'process_command': bench_process_command,
+    'command_confidence': bench_command_confidence,
+    'rank_commands': bench_rank_commands,
+    'detect_intent': bench_detect_intent,
+    'handle_command': bench_handle_command,
+    'pipeline': bench_pipeline,
+}
+
+
+def run_benchmarks(size=10000, custom_commands=0, names=None, seed=42,
+                   speech_fixtures=None, speech_backend_names=None, speech_payload=False) -> dict:
+    """
+    Run the selected benchmarks
+    
+    Args:
+        size: Utterances per benchmark
+        custom_commands: Extra custom commands registered on the brain
+        names: Benchmark names to run (default: all)
+        seed: Corpus random seed
+        speech_fixtures: WAV fixture directory for the speech backend comparison
+        speech_backend_names: Speech backends to compare (default: all)
+        speech_payload: Compare Google upload sizes at native and 16 kHz rates
+    
+    Returns:
+        Report dictionary
+    """
+    corpus = build_corpus(size, seed)
+    results = []
+    
+    for name in names or BENCHMARKS:
+        try:
+            result = BENCHMARKS[name](corpus, custom_commands)
+            results.extend(result if isinstance(result, list) else [result])
+        except ImportError as e:
+            logger.warning(f"Skipping {name}: {e}")
+            results.append({'name': name, 'skipped': str(e)})
+    
+    if speech_fixtures:
+        try:
+            results.extend(run_speech_benchmarks(speech_fixtures, speech_backend_names, speech_payload))
+        except ImportError as e:
+            logger.warning(f"Skipping speech backends: {e}")
+            results.append({'name': 'speech backends', 'skipped': str(e)})
+    
+    return {
+        'python': sys.version.split()[0],
+        'corpus_size': size,
+        'custom_commands': custom_commands,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def print_report(report: dict):
+    """Print a human-readable benchmark report"""
+    print("\n" + "="*80)
+    print("⏱️  VOICE COMMANDER AI - BENCHMARKS")
+    print(f"Corpus: {report['corpus_size']} utterances, "
+          f"{report['custom_commands']} custom commands")
+    print("="*80)
+    print(f"{'Benchmark':<48}{'ops/sec':>10}{'p50 us':>11}{'p99 us':>11}")
+    
+    for result in report['results']:
+        if 'skipped' in result:
+            print(f"{result['name']:<48}  skipped ({result['skipped']})")
+            continue
+        print(f"{result['name']:<48}{result['ops_per_sec']:>10.0f}"
+              f"{result['p50_us']:>11.1f}{result['p99_us']:>11.1f}")
+        if 'wer' in result:
+            wer = 'n/a' if result['wer'] is None else f"{result['wer']:.1%}"
+            print(f"    model load {result['load_seconds']:.2f}s, p50 {result['p50_us'] / 1e3:.0f} ms, "
+                  f"WER {wer}, {result['errors']} failed")
+        if 'avg_bytes' in result:
+            print(f"    {result['avg_bytes'] / 1024:.1f} KiB per request, "
+                  f"p50 {result['p50_us'] / 1e3:.0f} ms, {result['errors']} failed")
+    print("="*80 + "\n")
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark Voice Commander AI hot paths")
+    parser.add_argument('--size', type=int, default=10000, help="utterances per benchmark")
+    parser.add_argument('--custom-commands', type=int, default=0,
+                        help="extra custom commands to register")
+    parser.add_argument('--only', action='append', choices=list(BENCHMARKS),
+                        help="run only this benchmark (repeatable)")
+    parser.add_argument('--seed', type=int, default=42, help="corpus random seed")
+    parser.add_argument('--speech-fixtures', metavar='DIR',
+                        help="compare speech backends on the WAV files in DIR "
+                             "(with <name>.txt reference transcripts)")
+    parser.add_argument('--speech-backend', action='append',
+                        help="speech backend to compare (repeatable, default: all)")
+    parser.add_argument('--speech-payload', action='store_true',
+                        help="with --speech-fixtures, compare Google request bytes and "
+                             "latency for native-rate and resampled audio")
+    parser.add_argument('--json', metavar='PATH',
+                        help="write the JSON report to PATH ('-' for stdout)")
+    args = parser.parse_args(argv)
+    
+    report = run_benchmarks(args.size, args.custom_commands, args.only, args.seed,
+                            args.speech_fixtures, args.speech_backend, args.speech_payload)
+    
+    if args.json == '-':
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"Report saved to {args.json}")
+    
+    return report
+
+
+if __name__ == "__main__":
+    main()
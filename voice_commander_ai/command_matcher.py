@@ -0,0 +1,195 @@
+"""
+Command Matcher Module
+Compiled token-trie index for routing voice commands to handlers
+"""
+
+import re
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Extra weight given to a command's own keyword over a config synonym
+PRIMARY_KEYWORD_BONUS = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class CommandMatch(NamedTuple):
+    """A single keyword hit inside an utterance"""
+    command: str
+    phrase: str
+    position: int
+    score: int
+
+
+class CommandTable(dict):
+    """
+    Command dictionary that tracks modifications
+    
+    Every mutation bumps `version`, so indexes built from the table
+    know when they are stale.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+    
+    def _touch(self):
+        self.version += 1
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._touch()
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._touch()
+    
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._touch()
+        return result
+    
+    def popitem(self):
+        result = super().popitem()
+        self._touch()
+        return result
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._touch()
+        return super().setdefault(key, default)
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._touch()
+    
+    def clear(self):
+        super().clear()
+        self._touch()
+
+
+class CommandMatcher:
+    """
+    Multi-pattern matcher built once from a command table
+    
+    Every keyword and synonym is compiled into a trie keyed by word
+    tokens. A single pass over the utterance finds every candidate
+    command, so routing cost depends on the utterance length and not
+    on how many commands are registered.
+    """
+    
+    def __init__(self, commands: Iterable[str], synonyms: Optional[Dict[str, List[str]]] = None,
+                 match_names: bool = True):
+        """
+        Build the matcher
+        
+        Args:
+            commands: Command keywords in priority order
+            synonyms: Optional mapping of command keyword to extra phrases
+            match_names: Whether the command keywords themselves are phrases
+        """
+        self.order = {}
+        self.trie = {}
+        self.max_depth = 0
+        
+        for index, command in enumerate(commands):
+            self.order[command] = index
+            if match_names:
+                self._add_phrase(command, command, PRIMARY_KEYWORD_BONUS)
+        
+        for command, phrases in (synonyms or {}).items():
+            if command not in self.order:
+                continue
+            for phrase in phrases:
+                self._add_phrase(phrase, command, 0)
+    
+    def _add_phrase(self, phrase: str, command: str, bonus: int):
+        """Insert a phrase into the token trie"""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        
+        score = len(tokens) + bonus
+        # A phrase shared by several commands keeps the strongest owner
+        current = node.get(None)
+        if current is None or score > current[1] or (
+            score == current[1] and self.order[command] < self.order[current[0]]
+        ):
+            node[None] = (command, score, phrase)
+        self.max_depth = max(self.max_depth, len(tokens))
+    
+    def find_all(self, text: str) -> List[CommandMatch]:
+        """
+        Find every keyword hit in the text
+        
+        Args:
+            text: Voice command text
+        
+        Returns:
+            List of matches in order of appearance
+        """
+        tokens = tokenize(text)
+        matches = []
+        
+        for start in range(len(tokens)):
+            node = self.trie
+            for token in tokens[start:start + self.max_depth]:
+                node = node.get(token)
+                if node is None:
+                    break
+                entry = node.get(None)
+                if entry is not None:
+                    command, score, phrase = entry
+                    matches.append(CommandMatch(command, phrase, start, score))
+        
+        return matches
+    
+    def rank(self, text: str) -> List[CommandMatch]:
+        """
+        Rank candidate commands for the text
+        
+        Each command is represented by its strongest match. Longer phrases
+        and a command's own keyword score higher; ties go to the command
+        registered first.
+        
+        Args:
+            text: Voice command text
+        
+        Returns:
+            Best match per command, best first
+        """
+        best = {}
+        for match in self.find_all(text):
+            current = best.get(match.command)
+            if current is None or match.score > current.score:
+                best[match.command] = match
+        
+        return sorted(
+            best.values(),
+            key=lambda match: (-match.score, self.order[match.command], match.position)
+        )
+    
+    def best(self, text: str) -> Optional[str]:
+        """
+        Get the best command for the text
+        
+        Args:
+            text: Voice command text
+        
+        Returns:
+            Command keyword or None if nothing matched
+        """
+        ranked = self.rank(text)
+        return ranked[0].command if ranked else None
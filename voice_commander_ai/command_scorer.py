@@ -0,0 +1,215 @@
+"""
+Command Scorer Module
+Fuzzy confidence scoring of an utterance against every command at once
+"""
+
+import logging
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from command_matcher import tokenize
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class CommandScorer:
+    """
+    Token-incidence index over every command phrase and synonym
+    
+    Row i of the incidence matrix marks the tokens of phrase i. For an
+    utterance, the confidence of a phrase is the share of its tokens that
+    appear in the utterance, and a command's confidence is the best score
+    among its phrases. Single utterances are scored through an inverted
+    index over the matrix columns. With NumPy (and SciPy for a sparse
+    matrix) top_k_many scores a whole batch with one matrix product; the
+    libraries are imported and the matrix built on its first call, so
+    scoring single utterances never pays for them.
+    """
+    
+    def __init__(self, commands: Iterable[str], synonyms: Optional[Dict[str, List[str]]] = None):
+        """
+        Build the index
+        
+        Args:
+            commands: Command keywords
+            synonyms: Optional mapping of command keyword to extra phrases
+        """
+        self.commands = list(commands)
+        self.order = {command: index for index, command in enumerate(self.commands)}
+        synonyms = synonyms or {}
+        
+        self.vocabulary = {}
+        self.phrase_tokens = {}
+        self._last = (None, frozenset())
+        rows, cols, lengths, owners = [], [], [], []
+        for index, command in enumerate(self.commands):
+            for phrase in [command] + list(synonyms.get(command, [])):
+                tokens = set(tokenize(phrase))
+                if not tokens:
+                    continue
+                self.phrase_tokens.setdefault(command, []).append(tokens)
+                row = len(lengths)
+                for token in tokens:
+                    rows.append(row)
+                    cols.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                lengths.append(len(tokens))
+                owners.append(index)
+        
+        # Phrases are grouped by command, so each command owns a contiguous block of rows
+        self.owners = owners
+        self.lengths = lengths
+        self.postings = {}
+        for row, col in zip(rows, cols):
+            self.postings.setdefault(col, []).append(row)
+        
+        self._rows = rows
+        self._cols = cols
+        self._matrix_built = False
+        self.matrix = None
+    
+    def _build_matrix(self):
+        """Build the phrase incidence matrix if NumPy is available"""
+        self._matrix_built = True
+        if not self.lengths:
+            return
+        try:
+            import numpy as np
+        except ImportError:
+            logger.info("NumPy not installed; scoring batches one text at a time")
+            return
+        try:
+            from scipy import sparse
+        except ImportError:
+            sparse = None
+        
+        shape = (len(self.lengths), len(self.vocabulary))
+        data = np.ones(len(self._rows), dtype=np.float32)
+        if sparse is not None:
+            matrix = sparse.csc_matrix((data, (self._rows, self._cols)), shape=shape)
+        else:
+            matrix = np.zeros(shape, dtype=np.float32)
+            matrix[self._rows, self._cols] = 1.0
+        self.inverse_lengths = 1.0 / np.asarray(self.lengths, dtype=np.float32)
+        owners_array = np.asarray(self.owners)
+        self.command_rows = np.flatnonzero(np.r_[True, owners_array[1:] != owners_array[:-1]])
+        self.command_ids = owners_array[self.command_rows]
+        self._np = np
+        self._sparse = sparse
+        # Set last: a non-None matrix means everything above is ready
+        self.matrix = matrix
+    
+    def scores(self, text: str) -> Dict[str, float]:
+        """
+        Confidence of every command that shares a token with the text
+        
+        Args:
+            text: User input
+        
+        Returns:
+            Mapping of command keyword to confidence (0.0 to 1.0)
+        """
+        columns = {self.vocabulary[token] for token in tokenize(text) if token in self.vocabulary}
+        if not columns:
+            return {}
+        
+        # For one utterance, walking the postings of its few tokens beats
+        # the fixed overhead of a matrix operation
+        counts = {}
+        for col in columns:
+            for row in self.postings[col]:
+                counts[row] = counts.get(row, 0) + 1
+        result = {}
+        for row, count in counts.items():
+            command = self.commands[self.owners[row]]
+            result[command] = max(result.get(command, 0.0), count / self.lengths[row])
+        return result
+    
+    def score(self, text: str, command: str) -> float:
+        """
+        Confidence of a single command for the text
+        
+        Args:
+            text: User input
+            command: Command keyword
+        
+        Returns:
+            Confidence score (0.0 to 1.0)
+        """
+        # Callers often score one text against many commands in a row
+        last = self._last
+        if last[0] != text:
+            last = self._last = (text, frozenset(tokenize(text)))
+        tokens = last[1]
+        return max(
+            (len(phrase & tokens) / len(phrase) for phrase in self.phrase_tokens.get(command, [])),
+            default=0.0
+        )
+    
+    def top_k(self, text: str, k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Best matching commands for the text
+        
+        Args:
+            text: User input
+            k: Number of commands to return
+        
+        Returns:
+            List of (command, confidence), best first
+        """
+        ranked = sorted(self.scores(text).items(), key=lambda item: (-item[1], self.order[item[0]]))
+        return ranked[:k]
+    
+    def top_k_many(self, texts: Iterable[str], k: int = 3, chunk_size: int = 1024) -> Iterator[List[Tuple[str, float]]]:
+        """
+        Best matching commands for many texts
+        
+        Each chunk of texts becomes a token-incidence matrix that is
+        multiplied with the phrase matrix in one operation.
+        
+        Args:
+            texts: Iterable of user inputs
+            k: Number of commands per text
+            chunk_size: Texts scored per matrix product
+        
+        Yields:
+            List of (command, confidence) per text, best first
+        """
+        if not self._matrix_built:
+            self._build_matrix()
+        if self.matrix is None:
+            for text in texts:
+                yield self.top_k(text, k)
+            return
+        
+        np, sparse = self._np, self._sparse
+        iterator = iter(texts)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            rows, cols = [], []
+            for row, text in enumerate(chunk):
+                for col in {self.vocabulary[token] for token in tokenize(text) if token in self.vocabulary}:
+                    rows.append(row)
+                    cols.append(col)
+            
+            shape = (len(chunk), len(self.vocabulary))
+            if sparse is not None:
+                utterances = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=shape)
+                hits = np.asarray((utterances @ self.matrix.T).todense())
+            else:
+                utterances = np.zeros(shape, dtype=np.float32)
+                utterances[rows, cols] = 1.0
+                hits = utterances @ self.matrix.T
+            
+            confidence = hits * self.inverse_lengths
+            best = np.maximum.reduceat(confidence, self.command_rows, axis=1)
+            
+            for scores in best:
+                candidates = np.flatnonzero(scores)
+                ranked = sorted(
+                    ((self.commands[self.command_ids[i]], float(scores[i])) for i in candidates),
+                    key=lambda item: (-item[1], self.order[item[0]])
+                )
+                yield ranked[:k]
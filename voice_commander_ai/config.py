@@ -2,21 +2,83 @@
 Configuration file for Voice Commander AI
 """
 
+import os
+
 # Microphone settings
-MICROPHONE_INDEX = 0  # Default microphone (change if you have multiple)
+MICROPHONE_INDEX = None  # None = system default microphone (set an index if you have multiple)
 AMBIENT_NOISE_DURATION = 1  # Seconds to sample for noise adjustment
+NOISE_CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.noise_calibration.json')
+NOISE_CALIBRATION_MAX_AGE = 7 * 24 * 3600  # Recalibrate at startup when the saved value is older (seconds)
+NOISE_CALIBRATION_SAVE_INTERVAL = 60  # Seconds between saves of the adapted threshold
 
 # Speech Recognition settings
 TIMEOUT = 10  # Maximum time to wait for speech
 PHRASE_TIME_LIMIT = 15  # Maximum duration of a single phrase
+STT_BACKEND = os.getenv("STT_BACKEND", "google")  # 'google' (online), 'vosk' or 'sphinx' (offline)
+STT_LANGUAGE = 'en-US'  # Language for the google and sphinx backends
+CLOUD_SAMPLE_RATE = 16000  # Audio is downsampled to this rate before it is uploaded for recognition
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'vosk-model-small-en-us-0.15'))
+VAD_ENABLED = True  # Trim silence and drop non-speech before recognition (needs NumPy)
+VAD_PAUSE_SECONDS = 0.8  # Silence that splits a phrase into separately recognized segments
+VAD_MIN_SPEECH_SECONDS = 0.15  # Shorter bursts (clicks, bumps) are dropped
+VAD_PADDING_SECONDS = 0.2  # Audio kept before and after each speech segment
+BATCH_WORKERS = None  # Processes used by batch_transcribe.py (None = CPU count)
+PERSISTENT_MIC_STREAM = True  # Keep the microphone open and capture phrases in the background
+PHRASE_QUEUE_SIZE = 8  # Captured phrases waiting to be recognized (oldest dropped when full)
 
 # Text-to-Speech settings
 TTS_RATE = 150  # Words per minute
 TTS_VOLUME = 0.9  # Volume level (0.0 to 1.0)
+TTS_QUEUE_SIZE = 16  # Maximum utterances waiting for the speech worker
+TTS_NON_BLOCKING = True  # Keep listening while responses are spoken
+TTS_CACHE_ENABLED = True  # Play frequent responses from pre-rendered audio
+TTS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.tts_cache')
+TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Oldest audio is removed above this size
+TTS_CACHE_MIN_USES = 2  # Render text to the cache once it has been spoken this often
 
 # AI Settings
 ENABLE_RESPONSE_SPEECH = True
 CONTINUOUS_MODE = True
+BARGE_IN_ENABLED = True  # Stop speaking when the user starts talking (needs PERSISTENT_MIC_STREAM)
+BARGE_IN_ENERGY_FACTOR = 2.0  # Interrupting speech must be this much louder than the energy threshold
+BARGE_IN_MIN_SPEECH_SECONDS = 0.15  # Sustained speech needed before playback is cut
+PIPELINED_MAIN_LOOP = True  # Overlap listening with responding (asyncio pipeline)
+PIPELINE_QUEUE_SIZE = 4  # Items buffered between pipeline stages
+PIPELINE_CAPTURE_POLL = 1  # Seconds the capture stage waits before checking for shutdown
+ECHO_GUARD_ENABLED = True  # Drop phrases heard while a response plays, unless barge-in fired
+RESPONSE_CACHE_SIZE = 1024  # Maximum cached responses for deterministic commands
+HISTORY_MAX_MESSAGES = 10  # Messages of context sent to OpenAI
+HISTORY_MAX_TOKENS = 1000  # Estimated token budget for that context
+
+# Latency tracing (summarize with: python trace_report.py)
+TRACE_ENABLED = True  # Write per-utterance stage timings
+TRACE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'traces', 'latency.jsonl')
+TRACE_MAX_BYTES = 5 * 1024 * 1024  # Trace file is rotated at this size
+TRACE_BACKUP_COUNT = 3  # Rotated trace files kept
+
+# Startup (see: python main.py --startup-report)
+STARTUP_BUDGET_SECONDS = 3.0  # Warn when imports and initialization take longer
+
+# HTTP connection pool shared by the API integrations
+HTTP_POOL_HOSTS = 10  # Hosts whose keep-alive connections are kept
+HTTP_POOL_MAXSIZE = 4  # Keep-alive connections per host
+HTTP_CONNECT_TIMEOUT = 3.05  # Seconds to establish a connection
+HTTP_READ_TIMEOUT = 5  # Seconds to wait for response data
+HTTP_RETRIES = 2  # Retries for failed connections and 429/5xx responses (read timeouts are not retried)
+HTTP_BACKOFF_FACTOR = 0.3  # Retry delays grow as 0.3s, 0.6s, 1.2s...
+
+# Calculator settings
+CALC_TIMEOUT = 0.5  # Wall-clock budget per calculation in seconds
+CALC_MAX_EXPONENT = 10000  # Largest exponent allowed in a power
+CALC_MAX_FACTORIAL = 1000  # Largest number allowed in factorial()
+CALC_MAX_RESULT_BITS = 100000  # Largest integer result size in bits
+CALC_MAX_EXPRESSION_LENGTH = 200  # Longest expression accepted
+CALC_MAX_SERIES_TERMS = 50_000_000  # Most terms summed when a series has no closed form
+CALC_MAX_LOOP_TERMS = 1_000_000  # Most 64-bit words of terms summed exactly without NumPy (or beyond int64)
+
+# OpenAI streaming settings
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")  # Point at a local server for testing
+OPENAI_STREAM_TIMEOUT = 30  # Seconds to wait for the next streamed chunk
 
 # API Keys (set these in environment variables or .env file)
 OPENWEATHER_API_KEY = None  # Get from openweathermap.org
@@ -35,6 +97,9 @@ SUPPORTED_APPS = {
     'powerpoint': 'powerpnt',
 }
 
+# Intent packs (JSON files mapping intent names to keyword lists)
+INTENT_PACKS = []
+
 # Voice Commands Mapping
 VOICE_COMMANDS = {
     'time': ['what time', 'current time', 'tell me time'],
@@ -42,7 +107,8 @@ VOICE_COMMANDS = {
     'weather': ['weather', 'temperature', 'forecast'],
     'open': ['open', 'launch', 'start'],
     'search': ['search', 'google', 'find'],
-    'calculate': ['calculate', 'what is', 'solve'],
+    'calculate': ['calculate', 'what is', 'solve', 'sum of', 'product of', 'average of', 'mean of'],
     'hello': ['hello', 'hi', 'hey'],
     'help': ['help', 'commands', 'what can you do'],
+    'bye': ['bye', 'goodbye', 'see you'],
 }
@@ -0,0 +1,94 @@
+"""
+Conversation History Module
+Bounded, size-budgeted message history for chat completions
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Iterator, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for English text
+CHARS_PER_TOKEN = 4
+
+
+class ConversationHistory:
+    """
+    Ring buffer of chat messages with a message count and size budget
+    
+    The total content size is kept up to date on every append and
+    eviction, so both stay O(1) amortized and memory stays bounded no
+    matter how long the session runs.
+    """
+    
+    def __init__(self, max_messages: int = 10, max_chars: Optional[int] = None,
+                 max_tokens: Optional[int] = None):
+        """
+        Initialize the history
+        
+        Args:
+            max_messages: Maximum number of messages kept
+            max_chars: Maximum total content size in characters
+            max_tokens: Maximum total size in (estimated) tokens; overrides max_chars
+        """
+        if max_tokens is not None:
+            max_chars = max_tokens * CHARS_PER_TOKEN
+        self.max_messages = max_messages
+        self.max_chars = max_chars
+        self.total_chars = 0
+        self.evicted = 0
+        self._messages = deque()
+    
+    def append(self, message: Dict[str, str]):
+        """
+        Add a message, evicting the oldest ones that no longer fit
+        
+        Args:
+            message: Chat message with 'role' and 'content'
+        """
+        content = message.get('content') or ''
+        if self.max_chars is not None and len(content) > self.max_chars:
+            # A single oversized message is cut down to the whole budget
+            message = dict(message, content=content[:self.max_chars])
+            content = message['content']
+        
+        self._messages.append(message)
+        self.total_chars += len(content)
+        
+        while len(self._messages) > self.max_messages or (
+            self.max_chars is not None and self.total_chars > self.max_chars
+        ):
+            oldest = self._messages.popleft()
+            self.total_chars -= len(oldest.get('content') or '')
+            self.evicted += 1
+    
+    def add(self, role: str, content: str):
+        """Add a message by role and content"""
+        self.append({"role": role, "content": content})
+    
+    def messages(self) -> List[Dict[str, str]]:
+        """Messages to send with the next request, oldest first"""
+        return list(self._messages)
+    
+    @property
+    def estimated_tokens(self) -> int:
+        """Estimated token count of the current payload"""
+        return -(-self.total_chars // CHARS_PER_TOKEN)
+    
+    def clear(self):
+        """Forget the conversation"""
+        self._messages.clear()
+        self.total_chars = 0
+    
+    def __len__(self):
+        return len(self._messages)
+    
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(self._messages)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._messages)[index]
+        return self._messages[index]
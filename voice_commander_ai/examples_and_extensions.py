@@ -3,7 +3,9 @@ Examples and Extensions for Voice Commander AI
 Shows how to extend and customize the application
 """
 
+import config
 from ai_brain import AIBrain
+from intent_classifier import IntentClassifier
 from text_to_speech import TextToSpeech
 from voice_recognizer import VoiceRecognizer
 
@@ -143,26 +145,26 @@ class AnalyticsAI:
 class AdvancedVoiceAI:
     """Advanced voice AI with sentiment analysis and intent detection"""
     
-    def __init__(self):
+    def __init__(self, intent_packs=None):
         self.brain = AIBrain()
         self.recognizer = VoiceRecognizer()
         self.speaker = TextToSpeech()
+        
+        # Intents are compiled into a keyword index once, packs included
+        packs = config.INTENT_PACKS if intent_packs is None else intent_packs
+        self.intents = IntentClassifier(packs=packs)
     
     def detect_intent(self, text):
         """Detect user intent from text"""
-        
-        intents = {
-            'greeting': ['hello', 'hi', 'hey'],
-            'question': ['what', 'how', 'why', 'when'],
-            'command': ['open', 'close', 'start', 'stop'],
-            'information': ['tell', 'show', 'display'],
-        }
-        
-        for intent, keywords in intents.items():
-            if any(keyword in text for keyword in keywords):
-                return intent
-        
-        return 'unknown'
+        return self.intents.detect(text)
+    
+    def detect_intents(self, text, k=3):
+        """Detect the top-k intents with scores"""
+        return self.intents.classify(text, k)
+    
+    def detect_intents_batch(self, texts, k=3):
+        """Detect intents for many texts (yields (text, intents) pairs)"""
+        return self.intents.classify_many(texts, k)
     
     def estimate_confidence(self, text):
         """Estimate confidence in recognition (0-1)"""
@@ -179,7 +181,8 @@ class AdvancedVoiceAI:
     def process_with_analysis(self, text):
         """Process text with intent and confidence analysis"""
         
-        intent = self.detect_intent(text)
+        intents = self.detect_intents(text)
+        intent = intents[0][0] if intents else 'unknown'
         confidence = self.estimate_confidence(text)
         
         response = self.brain.process_command(text)
@@ -187,6 +190,7 @@ class AdvancedVoiceAI:
         return {
             'command': text,
             'intent': intent,
+            'intents': intents,
             'confidence': confidence,
             'response': response,
         }
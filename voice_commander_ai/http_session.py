@@ -0,0 +1,169 @@
+"""
+HTTP Session Module
+Shared keep-alive connection pool with timeouts and retries for the API integrations
+"""
+
+import threading
+import logging
+from typing import Optional
+
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class PooledSession:
+    """
+    requests.Session with bounded per-host connection pools
+    
+    Connections are kept alive and reused between calls, so repeated
+    requests to the same API skip the TCP and TLS handshakes. Every
+    request gets a connect and a read timeout, so a hung endpoint cannot
+    block the caller indefinitely, and failed connections and transient
+    errors are retried with exponential backoff. requests is imported
+    when the first request is made.
+    
+    Worst case for one call: (retries + 1) connect timeouts plus the
+    backoff delays for an unreachable host, or a single read timeout for
+    a host that accepts the connection and never answers (read timeouts
+    are not retried, and Retry-After headers are ignored).
+    """
+    
+    def __init__(self, pool_hosts: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                 connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                 retries: Optional[int] = None, backoff_factor: Optional[float] = None):
+        """
+        Initialize the session
+        
+        Args:
+            pool_hosts: Hosts whose pools are kept (default: config.HTTP_POOL_HOSTS)
+            pool_maxsize: Keep-alive connections per host (default: config.HTTP_POOL_MAXSIZE)
+            connect_timeout: Seconds to establish a connection (default: config.HTTP_CONNECT_TIMEOUT)
+            read_timeout: Seconds to wait for response data (default: config.HTTP_READ_TIMEOUT)
+            retries: Retries after the first attempt (default: config.HTTP_RETRIES)
+            backoff_factor: Retry delays are backoff_factor * 2**(retry - 1) seconds
+                (default: config.HTTP_BACKOFF_FACTOR)
+        """
+        self.pool_hosts = pool_hosts or config.HTTP_POOL_HOSTS
+        self.pool_maxsize = pool_maxsize or config.HTTP_POOL_MAXSIZE
+        self.timeout = (
+            config.HTTP_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout,
+            config.HTTP_READ_TIMEOUT if read_timeout is None else read_timeout,
+        )
+        self.retries = config.HTTP_RETRIES if retries is None else retries
+        self.backoff_factor = config.HTTP_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self.requests = 0
+        self.errors = 0
+        self._session = None
+        self._lock = threading.Lock()
+    
+    @property
+    def session(self):
+        """The underlying requests.Session, created on first use"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+    
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        retry = Retry(
+            total=self.retries,
+            # A request that timed out reading is not sent again, so a hung
+            # endpoint costs one read timeout rather than one per attempt
+            read=0,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            # Retry-After can ask for any wait (even hours); use our own backoff
+            respect_retry_after_header=False,
+            raise_on_status=False,  # Hand the last response to the caller
+        )
+        adapter = HTTPAdapter(pool_connections=self.pool_hosts, pool_maxsize=self.pool_maxsize,
+                              max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def get(self, url: str, params: Optional[dict] = None, **kwargs):
+        """
+        Send a GET request through the pool
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            kwargs: Passed to requests.Session.get (timeout defaults to
+                the session's (connect, read) timeouts)
+        
+        Returns:
+            requests.Response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        self.requests += 1
+        try:
+            return self.session.get(url, params=params, **kwargs)
+        except Exception:
+            self.errors += 1
+            raise
+    
+    def stats(self) -> dict:
+        """
+        Connection reuse statistics
+        
+        Returns:
+            Request and error counts, plus per host the requests sent, the
+            connections opened and how many requests reused a connection
+        """
+        hosts = {}
+        if self._session is not None:
+            for adapter in set(self._session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    host = hosts.setdefault(f"{pool.scheme}://{pool.host}:{pool.port}",
+                                            {'requests': 0, 'connections': 0})
+                    host['requests'] += pool.num_requests
+                    host['connections'] += pool.num_connections
+        for host in hosts.values():
+            host['reused'] = max(host['requests'] - host['connections'], 0)
+        
+        sent = sum(host['requests'] for host in hosts.values())
+        reused = sum(host['reused'] for host in hosts.values())
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'connections': sum(host['connections'] for host in hosts.values()),
+            'reuse_ratio': reused / sent if sent else 0.0,
+            'hosts': hosts,
+        }
+    
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_session() -> PooledSession:
+    """The process-wide session shared by all integrations"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = PooledSession()
+    return _shared
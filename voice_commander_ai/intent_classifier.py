@@ -0,0 +1,149 @@
+"""
+Intent Classifier Module
+Keyword-index intent detection with scored top-k results and intent packs
+"""
+
+import json
+import logging
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from command_matcher import CommandMatcher, tokenize
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTENTS = {
+    'greeting': ['hello', 'hi', 'hey'],
+    'question': ['what', 'how', 'why', 'when'],
+    'command': ['open', 'close', 'start', 'stop'],
+    'information': ['tell', 'show', 'display'],
+}
+
+
+def load_intent_pack(path: str) -> Dict[str, List[str]]:
+    """
+    Load an intent pack from a JSON file
+    
+    The file maps intent names to keyword lists, e.g.
+    {"music": ["play", "pause", "next song"]}.
+    
+    Args:
+        path: Path to the JSON file
+    
+    Returns:
+        Mapping of intent name to keywords
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        pack = json.load(f)
+    
+    if not isinstance(pack, dict) or not all(isinstance(words, list) for words in pack.values()):
+        raise ValueError(f"Intent pack {path} must map intent names to keyword lists")
+    return pack
+
+
+class IntentClassifier:
+    """
+    Classifies text into intents through a compiled keyword index
+    
+    Keywords (single words or phrases) are compiled once into a token
+    trie, so classification costs O(tokens) regardless of how many
+    intents are loaded. An intent's score is the share of the text's
+    tokens covered by its keywords. When packs share a keyword, the
+    intent registered first keeps it.
+    """
+    
+    def __init__(self, intents: Optional[Dict[str, List[str]]] = None, packs: Iterable[str] = ()):
+        """
+        Build the classifier
+        
+        Args:
+            intents: Mapping of intent name to keywords (default: DEFAULT_INTENTS)
+            packs: Paths of JSON intent packs to load on top
+        """
+        self.intents = {name: list(words) for name, words in (intents or DEFAULT_INTENTS).items()}
+        for path in packs:
+            self.add_intents(load_intent_pack(path), rebuild=False)
+        self._build()
+    
+    def _build(self):
+        """Compile the keyword index"""
+        self.matcher = CommandMatcher(self.intents.keys(), self.intents, match_names=False)
+    
+    def add_intents(self, intents: Dict[str, List[str]], rebuild: bool = True):
+        """
+        Add intents or extra keywords for existing intents
+        
+        Args:
+            intents: Mapping of intent name to keywords
+            rebuild: Recompile the index immediately
+        """
+        for name, words in intents.items():
+            self.intents.setdefault(name, []).extend(words)
+        if rebuild:
+            self._build()
+    
+    def classify(self, text: str, k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Score the text against every intent
+        
+        Args:
+            text: Text to classify
+            k: Number of intents to return
+        
+        Returns:
+            List of (intent, score) pairs, best first
+        """
+        token_count = len(tokenize(text))
+        if not token_count:
+            return []
+        
+        covered = {}
+        for match in self.matcher.find_all(text):
+            covered[match.command] = covered.get(match.command, 0) + match.score
+        
+        ranked = sorted(
+            covered.items(),
+            key=lambda item: (-item[1], self.matcher.order[item[0]])
+        )
+        return [(intent, min(count / token_count, 1.0)) for intent, count in ranked[:k]]
+    
+    def detect(self, text: str) -> str:
+        """
+        Get the best intent for the text
+        
+        Args:
+            text: Text to classify
+        
+        Returns:
+            Intent name or 'unknown'
+        """
+        ranked = self.classify(text, k=1)
+        return ranked[0][0] if ranked else 'unknown'
+    
+    def classify_many(self, texts: Iterable[str], k: int = 3, chunk_size: int = 1000) -> Iterator[Tuple[str, List[Tuple[str, float]]]]:
+        """
+        Classify many texts, e.g. for offline analysis of transcripts
+        
+        Texts are consumed lazily and identical texts within a chunk are
+        only classified once.
+        
+        Args:
+            texts: Iterable of texts
+            k: Number of intents per text
+            chunk_size: Texts classified together
+        
+        Yields:
+            (text, [(intent, score), ...]) pairs in input order
+        """
+        iterator = iter(texts)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            results = {}
+            for text in chunk:
+                if text not in results:
+                    results[text] = self.classify(text, k)
+                yield text, results[text]
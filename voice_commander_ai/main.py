@@ -3,12 +3,24 @@ Voice Commander AI - Main Application
 A voice-controlled AI assistant that listens to commands and responds
 """
 
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import os
 import sys
+import json
+import asyncio
+import argparse
 import logging
-from voice_recognizer import VoiceRecognizer
-from text_to_speech import TextToSpeech
+from contextlib import nullcontext
+import config
 from ai_brain import AIBrain
+from pipeline import VoicePipeline
+from tracing import Tracer, span
+from startup_timing import StartupReport
+
+# The recognizer and speech output (and the speech_recognition and pyttsx3
+# libraries behind them) are imported when first used, see VoiceCommanderAI
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,21 +28,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
 
 class VoiceCommanderAI:
     """Main Voice Commander AI Application"""
     
-    def __init__(self):
-        """Initialize the voice commander AI"""
+    EXIT_WORDS = ['stop', 'exit', 'bye', 'goodbye']
+    
+    def __init__(self, startup=None):
+        """
+        Initialize the voice commander AI
+        
+        The recognizer, speech output and brain are created on first use,
+        so a mode that does not need one never pays for it.
+        
+        Args:
+            startup: startup_timing.StartupReport that records the cost of
+                the imports and components (default: a new report)
+        """
+        self.startup = startup or StartupReport()
+        self.running = True
+        self.pipeline = None
+        self.tracer = Tracer() if config.TRACE_ENABLED else None
+        self._recognizer = None
+        self._speaker = None
+        self._brain = None
+    
+    @property
+    def brain(self):
+        if self._brain is None:
+            with self.startup.measure('AIBrain'):
+                self._brain = AIBrain()
+        return self._brain
+    
+    @property
+    def speaker(self):
+        if self._speaker is None:
+            self.startup.import_module('pyttsx3')
+            TextToSpeech = self.startup.import_module('text_to_speech').TextToSpeech
+            with self.startup.measure('TextToSpeech'):
+                self._speaker = TextToSpeech(rate=150, volume=0.9)
+            
+            # Render frequent responses to the audio cache in the background
+            self._speaker.prewarm(self.brain.GREETINGS + [
+                self.brain.show_help(""),
+                self.brain.goodbye(""),
+                "Goodbye!",
+            ])
+        return self._speaker
+    
+    @property
+    def recognizer(self):
+        if self._recognizer is None:
+            self.startup.import_module('speech_recognition')
+            VoiceRecognizer = self.startup.import_module('voice_recognizer').VoiceRecognizer
+            with self.startup.measure('VoiceRecognizer'):
+                self._recognizer = VoiceRecognizer()
+            
+            # Stop talking as soon as the user starts speaking
+            if config.BARGE_IN_ENABLED:
+                self._recognizer.on_speech_start = self.barge_in
+            # Don't answer our own voice picked up by the microphone
+            if config.ECHO_GUARD_ENABLED:
+                self._recognizer.is_playing = lambda: self._speaker is not None and self._speaker.is_speaking
+        return self._recognizer
+    
+    def initialize(self):
+        """
+        Create every component up front (for the continuous listening mode)
+        
+        Returns:
+            True if everything was initialized
+        """
         try:
             print("\n" + "="*50)
             print("🤖 VOICE COMMANDER AI - Initializing...")
             print("="*50 + "\n")
             
-            self.recognizer = VoiceRecognizer()
-            self.speaker = TextToSpeech(rate=150, volume=0.9)
-            self.brain = AIBrain()
-            self.running = True
+            self.brain
+            self.speaker
+            self.recognizer
+            self.startup.finish()
             
             print("✅ Voice Commander AI Ready!")
             print("Say 'help' to see available commands")
@@ -39,43 +118,126 @@ class VoiceCommanderAI:
         except Exception as e:
             logger.error(f"Initialization failed: {e}")
             self.running = False
+        return self.running
     
     def run(self):
         """Run the main voice command loop"""
-        if not self.running:
+        if not self.initialize():
             print("❌ Failed to initialize. Exiting...")
             return
         
         try:
-            while self.running:
+            if config.PIPELINED_MAIN_LOOP:
+                self.run_pipelined()
+            else:
+                self.run_serial()
+        
+        except KeyboardInterrupt:
+            print("\n\n⛔ Voice Commander stopped by user")
+            self.speaker.cancel()
+            self.speaker.speak("Goodbye!")
+        except Exception as e:
+            logger.error(f"Error in main loop: {e}")
+        finally:
+            self.cleanup()
+    
+    def is_exit(self, command):
+        """Check whether a command ends the session"""
+        return any(exit_word in command for exit_word in self.EXIT_WORDS)
+    
+    def _trace(self):
+        """Trace one utterance of the serial loop (no-op when tracing is off)"""
+        return self.tracer.trace(mode='serial') if self.tracer else nullcontext()
+    
+    @staticmethod
+    def _finish_trace(trace, status):
+        """Record how an utterance ended, with the statuses VoicePipeline uses"""
+        if trace is not None:
+            trace.finish(status=status)
+    
+    def run_serial(self):
+        """Listen, respond and speak one command at a time"""
+        while self.running:
+            with self._trace() as trace:
                 # Listen for voice input
-                command = self.recognizer.listen()
+                with span('listen'):
+                    command = self.recognizer.listen()
                 
                 if command is None:
                     print("⚠️  Could not understand. Please try again.\n")
+                    self._finish_trace(trace, 'unrecognized')
                     continue
                 
                 # Process command with AI brain
-                response = self.brain.process_command(command)
+                with span('route'):
+                    response = self.respond(command)
                 
                 if response:
-                    print(f"\n💬 AI Response: {response}\n")
-                    # Speak the response
-                    self.speaker.speak(response)
+                    # Speak the response (in the background, so listening resumes)
+                    with span('speak'):
+                        if config.TTS_NON_BLOCKING:
+                            self.speaker.speak_async(response)
+                        else:
+                            self.speaker.speak(response)
+                    self._finish_trace(trace, 'spoken')
+                else:
+                    self._finish_trace(trace, 'no_response')
                 
                 # Check for exit commands
-                if any(exit_word in command for exit_word in ['stop', 'exit', 'bye', 'goodbye']):
+                if self.is_exit(command):
                     self.speaker.speak("Goodbye! Have a great day!")
                     self.running = False
                     break
+    
+    def respond(self, command):
+        """Route a recognized command and show the response"""
+        response = self.brain.process_command(command)
+        if response:
+            print(f"\n💬 AI Response: {response}\n")
+        return response
+    
+    def barge_in(self):
+        """Cut the current response short because the user started speaking"""
+        # Called from the microphone thread: never create the speaker here
+        if self._speaker is None or not self._speaker.is_speaking:
+            return
+        self.speaker.cancel()
+        if self.pipeline is not None:
+            self.pipeline.interrupt()
+        print("✋ Interrupted - listening...")
+    
+    def recognize(self, audio):
+        """Recognize captured audio, reporting phrases that were not understood"""
+        command = self.recognizer.transcribe(audio)
+        if command is None:
+            print("⚠️  Could not understand. Please try again.\n")
+        return command
+    
+    def run_pipelined(self):
+        """
+        Run the command loop as an asyncio pipeline
         
-        except KeyboardInterrupt:
-            print("\n\n⛔ Voice Commander stopped by user")
-            self.speaker.speak("Goodbye!")
-        except Exception as e:
-            logger.error(f"Error in main loop: {e}")
-        finally:
-            self.cleanup()
+        The next command is captured and recognized while the previous
+        response is still being routed and spoken (see pipeline.py).
+        """
+        print("🎤 Listening...")
+        self.pipeline = VoicePipeline(
+            capture=lambda: self.recognizer.poll(timeout=config.PIPELINE_CAPTURE_POLL),
+            recognize=self.recognize,
+            route=self.respond,
+            speak=self.speaker.speak,
+            is_exit=self.is_exit,
+            tracer=self.tracer,
+        )
+        stats = asyncio.run(self.pipeline.run()).summary()
+        self.pipeline = None
+        self.speaker.speak("Goodbye! Have a great day!")
+        self.running = False
+        
+        if stats['p50_latency'] is not None:
+            logger.info(f"Pipeline: {stats['responses']} responses, {stats['interrupted']} interrupted, "
+                        f"p50 capture-to-speech {stats['p50_latency'] * 1000:.0f} ms, "
+                        f"p95 {stats['p95_latency'] * 1000:.0f} ms")
     
     def run_single_command(self):
         """Run single command mode (useful for testing)"""
@@ -83,6 +245,9 @@ class VoiceCommanderAI:
         print("🎤 SINGLE COMMAND MODE")
         print("="*50 + "\n")
         
+        self.recognizer
+        self.startup.finish()
+        
         command = self.recognizer.listen()
         
         if command:
@@ -93,12 +258,209 @@ class VoiceCommanderAI:
     
     def cleanup(self):
         """Cleanup resources"""
+        if self._recognizer is not None:
+            self._recognizer.stop()
+        if self.tracer is not None:
+            self.tracer.close()
         print("\n✅ Voice Commander AI shut down successfully")
         sys.exit(0)
 
 
-def main():
+class HeadlessCommander:
+    """
+    Text-only front end for scripted runs and load tests
+    
+    Commands are answered by the same brain (and optionally the API
+    integrations) as in voice mode, but the microphone and the speech
+    engine are never initialized.
+    """
+    
+    # Commands that launch programs or open the browser
+    SIDE_EFFECT_COMMANDS = ('open', 'search')
+    
+    def __init__(self, use_integrations=False, allow_side_effects=False):
+        """
+        Initialize the headless commander
+        
+        Args:
+            use_integrations: Try the API integrations before the brain
+            allow_side_effects: Really open applications and web searches
+        """
+        self.brain = AIBrain()
+        self.integrations = None
+        if use_integrations:
+            from api_integrations import IntegratedVoiceAI
+            self.integrations = IntegratedVoiceAI()
+        
+        if not allow_side_effects:
+            for command in self.SIDE_EFFECT_COMMANDS:
+                self.brain.commands[command] = lambda text, command=command: f"[dry run] {command}: {text}"
+    
+    def respond(self, command):
+        """Answer one text command"""
+        command = command.strip().lower()
+        if self.integrations is not None:
+            response = self.integrations.handle_command(command)
+            if response is not None:
+                return response
+        return self.brain.process_command(command)
+    
+    @staticmethod
+    def read_commands(stream):
+        """Yield the non-blank input lines, stripped"""
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line
+    
+    @staticmethod
+    def parse_line(line):
+        """
+        Parse an input line: plain text, or a JSONL object with a "text" field
+        
+        Returns:
+            (record, text) where record holds the JSONL fields (or is empty)
+        
+        Raises:
+            ValueError: Malformed JSON or a "text" field that is not a string
+        """
+        if not line.startswith('{'):
+            return {}, line
+        record = json.loads(line)
+        if not isinstance(record, dict) or not isinstance(record.get('text', ''), str):
+            raise ValueError("expected an object with a string 'text' field")
+        return record, record.get('text', '')
+    
+    def run(self, stream, output, jsonl=False):
+        """
+        Answer every command from a stream
+        
+        A command that cannot be parsed or answered produces an error
+        record (or an "[error]" line) and is counted, instead of ending
+        the run.
+        
+        Args:
+            stream: Input lines
+            output: Writable text stream for responses
+            jsonl: Write JSONL records (text, response, ms) instead of plain responses
+        
+        Returns:
+            Summary with count, errors, elapsed seconds, throughput and latency percentiles
+        """
+        latencies = []
+        errors = 0
+        clock = time.perf_counter
+        start = clock()
+        for line in self.read_commands(stream):
+            t0 = clock()
+            record, text, response, error = {}, line, None, None
+            try:
+                record, text = self.parse_line(line)
+                response = self.respond(text)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                errors += 1
+            elapsed = clock() - t0
+            
+            if error is not None:
+                logger.warning(f"Command failed ({error}): {line[:80]}")
+                if jsonl:
+                    output.write(json.dumps(dict(record, text=text, error=error)) + '\n')
+                else:
+                    output.write(f"[error] {error}\n")
+                continue
+            latencies.append(elapsed)
+            
+            if jsonl:
+                output.write(json.dumps(dict(record, text=text, response=response,
+                                             ms=round(elapsed * 1000, 4))) + '\n')
+            else:
+                output.write(f"{response if response is not None else ''}\n")
+        total = clock() - start
+        
+        latencies.sort()
+        
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000 if latencies else 0.0
+        
+        return {
+            'commands': len(latencies) + errors,
+            'errors': errors,
+            'seconds': total,
+            'commands_per_sec': (len(latencies) + errors) / total if total else 0.0,
+            'p50_ms': percentile(50),
+            'p99_ms': percentile(99),
+        }
+
+
+def startup_report(args):
+    """
+    Start the startup report for a run
+    
+    Created once the mode is known, so time spent at the menu prompt is
+    not counted; the module imports measured above are.
+    """
+    report = StartupReport(origin=time.perf_counter() - _IMPORT_SECONDS, verbose=args.startup_report)
+    report.record('import', 'main modules', _IMPORT_SECONDS)
+    return report
+
+
+def run_headless(args):
+    """Run text commands from a file or stdin without audio devices"""
+    startup = startup_report(args)
+    with startup.measure('HeadlessCommander'):
+        commander = HeadlessCommander(use_integrations=args.integrations,
+                                      allow_side_effects=args.allow_side_effects)
+    startup.finish()
+    
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        summary = commander.run(source, output, jsonl=args.jsonl)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+        else:
+            output.flush()
+    
+    print(f"{summary['commands']} commands ({summary['errors']} failed) in {summary['seconds']:.3f}s "
+          f"({summary['commands_per_sec']:.0f}/s, p50 {summary['p50_ms']:.3f} ms, "
+          f"p99 {summary['p99_ms']:.3f} ms)", file=sys.stderr)
+    if commander.integrations is not None:
+        http = commander.integrations.connection_stats()
+        if http['requests']:
+            print(f"HTTP: {http['requests']} requests, {http['connections']} connections opened, "
+                  f"{http['reuse_ratio']:.0%} reused, {http['errors']} errors", file=sys.stderr)
+    return summary
+
+
+def parse_args(argv=None):
+    """Command-line options"""
+    parser = argparse.ArgumentParser(description="Voice Commander AI")
+    parser.add_argument('--headless', action='store_true',
+                        help="answer text commands without microphone or speech output")
+    parser.add_argument('--input', default='-',
+                        help="headless input: text lines or JSONL with a 'text' field ('-' = stdin)")
+    parser.add_argument('--output', default='-', help="headless output file ('-' = stdout)")
+    parser.add_argument('--jsonl', action='store_true',
+                        help="write JSONL records (text, response, ms) instead of plain responses")
+    parser.add_argument('--integrations', action='store_true',
+                        help="route commands through the API integrations first")
+    parser.add_argument('--allow-side-effects', action='store_true',
+                        help="really open applications and browser searches in headless mode")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="print how long imports and component initialization took")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main entry point"""
+    args = parse_args(argv)
+    if args.headless:
+        return run_headless(args)
+    
     print("\n" + "="*50)
     print("    VOICE COMMANDER AI")
     print("="*50)
@@ -109,15 +471,16 @@ def main():
     
     choice = input("\nEnter your choice (1-3): ").strip()
     
-    ai = VoiceCommanderAI()
+    if choice == '3':
+        print("Exiting...")
+        sys.exit(0)
+    
+    ai = VoiceCommanderAI(startup=startup_report(args))
     
     if choice == '1':
         ai.run()
     elif choice == '2':
         ai.run_single_command()
-    elif choice == '3':
-        print("Exiting...")
-        sys.exit(0)
     else:
         print("Invalid choice. Running in continuous mode...")
         ai.run()
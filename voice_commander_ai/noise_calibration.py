@@ -0,0 +1,102 @@
+"""
+Noise Calibration Module
+Persists microphone energy-threshold calibration per input device
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Recognizer attributes that make up a calibration
+CALIBRATION_FIELDS = (
+    'energy_threshold',
+    'dynamic_energy_threshold',
+    'dynamic_energy_adjustment_damping',
+    'dynamic_energy_ratio',
+)
+
+
+def device_key(device_index: Optional[int]) -> str:
+    """Storage key for a microphone index (None = system default)"""
+    return 'default' if device_index is None else str(device_index)
+
+
+class CalibrationStore:
+    """JSON file of recognizer calibrations keyed by microphone"""
+    
+    def __init__(self, path: str, max_age: Optional[float] = None):
+        """
+        Initialize the store
+        
+        Args:
+            path: JSON file path
+            max_age: Seconds after which a saved calibration is ignored (None = never)
+        """
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+    
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable noise calibration {self.path}: {e}")
+            return {}
+    
+    def load(self, device_index: Optional[int]) -> Optional[dict]:
+        """
+        Saved calibration for a device
+        
+        Args:
+            device_index: Microphone index
+        
+        Returns:
+            Calibration dictionary, or None if missing or too old
+        """
+        with self._lock:
+            entry = self._read().get(device_key(device_index))
+        if not entry:
+            return None
+        if self.max_age is not None and time.time() - entry.get('updated', 0) > self.max_age:
+            return None
+        return entry
+    
+    def save(self, device_index: Optional[int], recognizer):
+        """
+        Store the recognizer's current calibration for a device
+        
+        Args:
+            device_index: Microphone index
+            recognizer: speech_recognition Recognizer
+        """
+        entry = {field: getattr(recognizer, field) for field in CALIBRATION_FIELDS}
+        entry['updated'] = time.time()
+        
+        with self._lock:
+            data = self._read()
+            data[device_key(device_index)] = entry
+            directory = os.path.dirname(os.path.abspath(self.path))
+            try:
+                handle, tmp_path = tempfile.mkstemp(prefix='.calibration-', dir=directory)
+                with os.fdopen(handle, 'w') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save noise calibration: {e}")
+
+
+def apply_calibration(recognizer, calibration: dict):
+    """Set saved calibration fields on a recognizer"""
+    for field in CALIBRATION_FIELDS:
+        if field in calibration:
+            setattr(recognizer, field, calibration[field])
@@ -0,0 +1,204 @@
+"""
+Pipeline Module
+Asyncio runtime that overlaps capture, recognition, routing and speech
+"""
+
+import time
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Returned by the capture stage when there is no more input
+END = object()
+
+# Passed down the queues to shut the next stage down
+_DONE = object()
+
+
+class PipelineStats:
+    """Latency and throughput of the utterances that went through the pipeline"""
+    
+    def __init__(self):
+        self.captured = 0
+        self.unrecognized = 0
+        self.responses = 0
+        self.interrupted = 0
+        self.latencies: List[float] = []
+        self.started = time.perf_counter()
+        self.finished = None
+    
+    def summary(self) -> dict:
+        """Counts, throughput and capture-to-speech latency percentiles (seconds)"""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        latencies = sorted(self.latencies)
+        
+        def percentile(p):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+        
+        return {
+            'captured': self.captured,
+            'unrecognized': self.unrecognized,
+            'responses': self.responses,
+            'interrupted': self.interrupted,
+            'seconds': elapsed,
+            'utterances_per_sec': self.captured / elapsed if elapsed else 0.0,
+            'p50_latency': percentile(50),
+            'p95_latency': percentile(95),
+        }
+
+
+class VoicePipeline:
+    """
+    Four-stage pipeline: capture -> recognize -> route -> speak
+    
+    Each stage is a blocking callable run in a worker thread and the stages
+    are joined by bounded asyncio queues, so the next utterance is captured
+    and recognized while the previous one is still being answered, and a
+    slow stage holds the earlier ones back instead of piling up work.
+    Stages keep their input order.
+    """
+    
+    def __init__(self, capture: Callable, recognize: Callable, route: Callable, speak: Callable,
+                 is_exit: Optional[Callable] = None, queue_size: Optional[int] = None,
+                 tracer=None):
+        """
+        Initialize the pipeline
+        
+        Args:
+            capture: Returns captured audio, None if nothing was heard, or END
+            recognize: Turns audio into text (None if not understood)
+            route: Turns text into a response (None for no response)
+            speak: Speaks a response, returning when done
+            is_exit: Tells whether a command ends the session
+            queue_size: Items buffered between stages (default: config.PIPELINE_QUEUE_SIZE)
+            tracer: tracing.Tracer that gets one trace per captured utterance
+        """
+        self.capture = capture
+        self.recognize = recognize
+        self.route = route
+        self.speak = speak
+        self.is_exit = is_exit or (lambda text: False)
+        self.queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+        self.tracer = tracer
+        self.stats = PipelineStats()
+        self._stopping = False
+        self._interrupted_at = 0.0
+    
+    def stop(self):
+        """Stop capturing; responses already routed are still spoken"""
+        self._stopping = True
+    
+    def interrupt(self):
+        """
+        Drop responses to commands captured before now (barge-in)
+        
+        Safe to call from any thread; the speech stage skips stale
+        responses instead of speaking them.
+        """
+        self._interrupted_at = time.perf_counter()
+    
+    @staticmethod
+    def _in_thread(func, *args):
+        """Run a blocking stage function in the default executor"""
+        return asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    def _run_stage(self, trace, stage, func, arg):
+        """Call a stage function as a span of the utterance's trace"""
+        if trace is None:
+            return func(arg)
+        with trace.activate(), trace.span(stage):
+            return func(arg)
+    
+    @staticmethod
+    def _finish(trace, status):
+        if trace is not None:
+            trace.finish(status=status)
+    
+    async def _capture_stage(self, output: asyncio.Queue):
+        while not self._stopping:
+            audio = await self._in_thread(self.capture)
+            if audio is END:
+                break
+            if audio is None:
+                continue
+            self.stats.captured += 1
+            trace = self.tracer.start(mode='pipeline') if self.tracer else None
+            await output.put((time.perf_counter(), trace, audio))
+        await output.put(_DONE)
+    
+    async def _recognize_stage(self, source: asyncio.Queue, output: asyncio.Queue):
+        while True:
+            item = await source.get()
+            if item is _DONE:
+                break
+            captured_at, trace, audio = item
+            text = await self._in_thread(self._run_stage, trace, 'recognize', self.recognize, audio)
+            if text is None:
+                self.stats.unrecognized += 1
+                self._finish(trace, 'unrecognized')
+                continue
+            await output.put((captured_at, trace, text))
+        await output.put(_DONE)
+    
+    async def _route_stage(self, source: asyncio.Queue, output: asyncio.Queue):
+        while True:
+            item = await source.get()
+            if item is _DONE:
+                break
+            captured_at, trace, text = item
+            if self._stopping:
+                # Commands heard after an exit command are not answered
+                self._finish(trace, 'dropped')
+                continue
+            response = await self._in_thread(self._run_stage, trace, 'route', self.route, text)
+            if response:
+                await output.put((captured_at, trace, response))
+            else:
+                self._finish(trace, 'no_response')
+            if self.is_exit(text):
+                self.stop()
+        await output.put(_DONE)
+    
+    async def _speak_stage(self, source: asyncio.Queue):
+        while True:
+            item = await source.get()
+            if item is _DONE:
+                break
+            captured_at, trace, response = item
+            if captured_at < self._interrupted_at:
+                self.stats.interrupted += 1
+                self._finish(trace, 'interrupted')
+                continue
+            self.stats.latencies.append(time.perf_counter() - captured_at)
+            self.stats.responses += 1
+            await self._in_thread(self._run_stage, trace, 'speak', self.speak, response)
+            self._finish(trace, 'spoken')
+    
+    async def run(self) -> PipelineStats:
+        """
+        Run until the capture stage ends or an exit command is routed
+        
+        Returns:
+            Pipeline statistics
+        """
+        audio_queue = asyncio.Queue(self.queue_size)
+        text_queue = asyncio.Queue(self.queue_size)
+        speech_queue = asyncio.Queue(self.queue_size)
+        
+        self._stopping = False
+        self.stats = PipelineStats()
+        await asyncio.gather(
+            self._capture_stage(audio_queue),
+            self._recognize_stage(audio_queue, text_queue),
+            self._route_stage(text_queue, speech_queue),
+            self._speak_stage(speech_queue),
+        )
+        self.stats.finished = time.perf_counter()
+        return self.stats
@@ -0,0 +1,177 @@
+"""
+Plugin Registry Module
+Lazy registry of command handlers and integrations, imported on first use
+"""
+
+import importlib
+import threading
+import logging
+from typing import Dict, List, NamedTuple, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = 'voice_commander_ai.plugins'
+
+
+def resolve(target: str):
+    """
+    Import an object from a "module:attribute" path
+    
+    Args:
+        target: Import path such as "api_integrations:WeatherIntegration"
+    
+    Returns:
+        The imported object
+    """
+    module_name, _, attribute = target.partition(':')
+    obj = importlib.import_module(module_name)
+    for part in filter(None, attribute.split('.')):
+        obj = getattr(obj, part)
+    return obj
+
+
+class PluginSpec(NamedTuple):
+    """A registered plugin: its keywords are known before it is imported"""
+    name: str
+    keywords: List[str]
+    target: str
+
+
+class LazyHandler:
+    """
+    Command handler that imports its implementation on first call
+    
+    The target may be a function taking the command text, or a class
+    whose instances provide handle_command(text).
+    """
+    
+    def __init__(self, target: str):
+        self.target = target
+        self._handler = None
+        self._lock = threading.Lock()
+    
+    def load(self):
+        """Import and construct the handler if not done yet"""
+        if self._handler is None:
+            with self._lock:
+                if self._handler is None:
+                    obj = resolve(self.target)
+                    if isinstance(obj, type):
+                        obj = obj().handle_command
+                    self._handler = obj
+                    logger.info(f"Loaded handler {self.target}")
+        return self._handler
+    
+    @property
+    def loaded(self) -> bool:
+        return self._handler is not None
+    
+    def __call__(self, command: str):
+        return self.load()(command)
+    
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"LazyHandler({self.target!r}, {state})"
+
+
+class PluginRegistry:
+    """Keyword-routed plugins that are imported and constructed on demand"""
+    
+    def __init__(self):
+        self.specs: Dict[str, PluginSpec] = {}
+        self._instances = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name: str, keywords: List[str], target: str):
+        """
+        Register a plugin without importing it
+        
+        Args:
+            name: Plugin name
+            keywords: Keywords that route a command to this plugin
+            target: "module:attribute" path of the plugin class or factory
+        """
+        self.specs[name] = PluginSpec(name, list(keywords), target)
+        self._instances.pop(name, None)
+    
+    def discover(self, group: str = ENTRY_POINT_GROUP) -> int:
+        """
+        Register plugins advertised through package entry points
+        
+        The entry point name lists the plugin keywords separated by commas
+        (the first one is the plugin name), e.g.
+        "joke,tell a joke = my_package.jokes:JokeIntegration".
+        Entry points are not loaded until the plugin is first used.
+        
+        Args:
+            group: Entry point group to scan
+        
+        Returns:
+            Number of plugins registered
+        """
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return 0
+        
+        found = entry_points()
+        if hasattr(found, 'select'):
+            found = found.select(group=group)
+        else:
+            found = found.get(group, [])
+        
+        count = 0
+        for entry_point in found:
+            keywords = [keyword.strip() for keyword in entry_point.name.split(',') if keyword.strip()]
+            if not keywords:
+                continue
+            self.register(keywords[0], keywords, entry_point.value)
+            count += 1
+        if count:
+            logger.info(f"Discovered {count} plugin(s) in '{group}'")
+        return count
+    
+    def match(self, command: str) -> Optional[str]:
+        """
+        Find the first registered plugin with a keyword in the command
+        
+        Args:
+            command: Command text
+        
+        Returns:
+            Plugin name or None
+        """
+        for spec in self.specs.values():
+            if any(keyword in command for keyword in spec.keywords):
+                return spec.name
+        return None
+    
+    def get(self, name: str):
+        """
+        Get a plugin instance, importing and constructing it on first use
+        
+        Args:
+            name: Plugin name
+        
+        Returns:
+            Plugin instance
+        """
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    obj = resolve(self.specs[name].target)
+                    instance = obj() if callable(obj) else obj
+                    self._instances[name] = instance
+                    logger.debug(f"Loaded plugin '{name}'")
+        return instance
+    
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a plugin has been constructed yet"""
+        return name in self._instances
+    
+    def loaded(self) -> List[str]:
+        """Names of plugins constructed so far"""
+        return list(self._instances)
@@ -0,0 +1,163 @@
+"""
+Response Cache Module
+Bounded LRU cache and per-handler caching policies for AI responses
+"""
+
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Callable, Hashable, NamedTuple, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CachePolicy(NamedTuple):
+    """
+    How a handler's responses may be reused
+    
+    Attributes:
+        ttl: Seconds a response stays valid (None = until evicted)
+        bucket: Function returning the current time bucket, if any
+        key_on_text: Whether the command text is part of the cache key
+    """
+    ttl: Optional[float] = None
+    bucket: Optional[Callable[[], Hashable]] = None
+    key_on_text: bool = False
+
+
+def pure(key_on_text: bool = False) -> CachePolicy:
+    """Policy for handlers whose response never changes"""
+    return CachePolicy(key_on_text=key_on_text)
+
+
+def ttl(seconds: float, key_on_text: bool = True) -> CachePolicy:
+    """Policy for responses that stay valid for a fixed time"""
+    return CachePolicy(ttl=seconds, key_on_text=key_on_text)
+
+
+def time_bucketed(bucket: Callable[[], Hashable], key_on_text: bool = False) -> CachePolicy:
+    """Policy for responses that only change when the time bucket changes"""
+    return CachePolicy(bucket=bucket, key_on_text=key_on_text)
+
+
+def minute_bucket() -> int:
+    """Current wall-clock minute (time zone offsets are whole minutes)"""
+    return int(time.time() // 60)
+
+
+def day_bucket() -> tuple:
+    """Current local calendar day"""
+    return time.localtime()[:3]
+
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with optional per-entry expiry"""
+    
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the cache
+        
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Get a cached value, counting the hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+    
+    def set(self, key, value, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry if full"""
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def stats(self) -> dict:
+        """Get hit/miss counters and current size"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+class ResponseCache:
+    """Applies caching policies to handler calls"""
+    
+    def __init__(self, policies: dict, maxsize: int = 1024):
+        """
+        Initialize the response cache
+        
+        Args:
+            policies: Mapping of command keyword to CachePolicy
+            maxsize: Maximum number of cached responses
+        """
+        self.policies = policies
+        self.cache = LRUCache(maxsize)
+    
+    def call(self, command: str, handler: Callable[[str], str], text: str) -> str:
+        """
+        Call a handler, serving the response from cache when its policy allows
+        
+        Args:
+            command: Command keyword the handler is registered under
+            handler: Handler function
+            text: Command text passed to the handler
+        
+        Returns:
+            Handler response
+        """
+        policy = self.policies.get(command)
+        if policy is None:
+            return handler(text)
+        
+        key = (
+            command,
+            text if policy.key_on_text else None,
+            policy.bucket() if policy.bucket is not None else None,
+        )
+        response = self.cache.get(key, _MISSING)
+        if response is _MISSING:
+            response = handler(text)
+            self.cache.set(key, response, policy.ttl)
+        return response
+    
+    def clear(self):
+        """Drop all cached responses"""
+        self.cache.clear()
+    
+    def stats(self) -> dict:
+        """Get cache statistics"""
+        return self.cache.stats()
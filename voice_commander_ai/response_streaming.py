@@ -0,0 +1,117 @@
+"""
+Response Streaming Module
+Streams chat completions token by token and cuts them into sentences for speech
+"""
+
+import os
+import re
+import json
+import logging
+import urllib.request
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SENTENCE_END = re.compile(r'([.!?]+["\')\]]*)(\s+)')
+
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'prof', 'st', 'vs', 'etc', 'e.g', 'i.e', 'no', 'approx'}
+
+
+def stream_chat_completion(messages: List[Dict[str, str]], api_key: Optional[str] = None,
+                           model: str = "gpt-3.5-turbo", max_tokens: int = 150,
+                           temperature: float = 0.7, api_base: Optional[str] = None,
+                           timeout: Optional[float] = None) -> Iterator[str]:
+    """
+    Stream a chat completion from an OpenAI-compatible endpoint
+    
+    Uses server-sent events (stream=true) so text can be used as soon as it
+    arrives. Point api_base (or OPENAI_API_BASE) at a local server to test
+    without the real API.
+    
+    Args:
+        messages: Chat messages
+        api_key: API key (default: OPENAI_API_KEY environment variable)
+        model: Model name
+        max_tokens: Maximum tokens to generate
+        temperature: Sampling temperature
+        api_base: Base URL of the API (default: config.OPENAI_API_BASE)
+        timeout: Socket timeout in seconds (default: config.OPENAI_STREAM_TIMEOUT)
+    
+    Yields:
+        Text fragments in generation order
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    api_base = (api_base or config.OPENAI_API_BASE).rstrip('/')
+    timeout = timeout if timeout is not None else config.OPENAI_STREAM_TIMEOUT
+    
+    body = json.dumps({
+        "model": model,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "stream": True,
+    }).encode('utf-8')
+    
+    request = urllib.request.Request(
+        f"{api_base}/chat/completions",
+        data=body,
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+            "Authorization": f"Bearer {api_key}",
+        },
+        method="POST",
+    )
+    
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        for raw_line in response:
+            line = raw_line.decode('utf-8').strip()
+            if not line.startswith('data:'):
+                continue
+            
+            data = line[len('data:'):].strip()
+            if data == '[DONE]':
+                break
+            
+            event = json.loads(data)
+            choices = event.get('choices') or [{}]
+            content = (choices[0].get('delta') or {}).get('content')
+            if content:
+                yield content
+
+
+def split_sentences(fragments: Iterable[str]) -> Iterator[str]:
+    """
+    Regroup streamed text fragments into complete sentences
+    
+    A sentence is yielded as soon as its end punctuation is followed by
+    whitespace, so speech can start before the rest of the text arrives.
+    
+    Args:
+        fragments: Text fragments, e.g. tokens from a streaming completion
+    
+    Yields:
+        Sentences, with any unterminated tail yielded last
+    """
+    buffer = ''
+    for fragment in fragments:
+        buffer += fragment
+        start = 0
+        for match in SENTENCE_END.finditer(buffer):
+            candidate = buffer[start:match.end(1)]
+            last_word = candidate.rsplit(None, 1)[-1].rstrip('.!?"\')]').lower()
+            if match.group(1).startswith('.') and last_word in ABBREVIATIONS:
+                continue
+            sentence = candidate.strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        buffer = buffer[start:]
+    
+    tail = buffer.strip()
+    if tail:
+        yield tail
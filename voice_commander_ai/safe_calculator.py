@@ -0,0 +1,268 @@
+"""
+Safe Calculator Module
+AST-based arithmetic evaluation for spoken math with cost limits
+"""
+
+import ast
+import math
+import re
+import time
+import logging
+import operator
+from functools import lru_cache
+
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CalculationError(ValueError):
+    """Raised when an expression cannot be evaluated"""
+
+
+class CalculationTooExpensive(CalculationError):
+    """Raised when an expression exceeds the configured cost limits"""
+
+
+# Spoken operators rewritten to Python syntax (longest phrases first)
+SPOKEN_OPERATORS = [
+    ('to the power of', '**'),
+    ('multiplied by', '*'),
+    ('divided by', '/'),
+    ('raised to', '**'),
+    ('squared', '**2'),
+    ('cubed', '**3'),
+    ('modulo', '%'),
+    ('times', '*'),
+    ('plus', '+'),
+    ('minus', '-'),
+    ('over', '/'),
+    ('mod', '%'),
+    ('x', '*'),
+]
+
+SPOKEN_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(phrase) for phrase, _ in SPOKEN_OPERATORS) + r')\b'
+)
+SPOKEN_MAP = dict(SPOKEN_OPERATORS)
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+FUNCTIONS = {
+    'abs': abs,
+    'round': round,
+    'sqrt': math.sqrt,
+    'factorial': math.factorial,
+    'log': math.log,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+}
+
+# Integers longer than this (about 1000 digits) are given in scientific notation
+MAX_EXACT_BITS = 3322
+SCIENTIFIC_DIGITS = 10
+LOG10_2 = math.log10(2)
+
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+}
+
+
+def normalize_expression(text: str) -> str:
+    """
+    Turn spoken math into a Python expression string
+    
+    Args:
+        text: Spoken expression such as "5 times 3 plus 2"
+    
+    Returns:
+        Expression string such as "5 * 3 + 2"
+    """
+    expr = text.lower().replace('^', '**').replace(',', '')
+    expr = SPOKEN_PATTERN.sub(lambda match: f" {SPOKEN_MAP[match.group(1)]} ", expr)
+    return ' '.join(expr.split())
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expr: str) -> ast.AST:
+    """
+    Parse and validate an expression, caching the result
+    
+    Args:
+        expr: Python expression string
+    
+    Returns:
+        Validated expression AST
+    """
+    if len(expr) > config.CALC_MAX_EXPRESSION_LENGTH:
+        raise CalculationTooExpensive("Expression is too long")
+    
+    try:
+        tree = ast.parse(expr, mode='eval')
+    except SyntaxError as e:
+        raise CalculationError(f"Invalid expression: {expr}") from e
+    
+    # Function names are only valid as the function of a call
+    called = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Expression, ast.Load, ast.operator, ast.unaryop)):
+            continue
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            continue
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            continue
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            continue
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+                and node.func.id in FUNCTIONS and not node.keywords:
+            continue
+        if isinstance(node, ast.Name) and (node.id in CONSTANTS
+                                           or (node.id in FUNCTIONS and id(node) in called)):
+            continue
+        raise CalculationError(f"Unsupported element in expression: {type(node).__name__}")
+    
+    return tree.body
+
+
+def format_number(value) -> str:
+    """
+    Text of a result, in scientific notation when the integer is too long to read out
+    
+    Python also refuses to convert integers of more than 4300 digits to
+    text by default, so those must not go through str().
+    
+    Args:
+        value: Calculation result
+    
+    Returns:
+        Result text such as "120" or "1.0000000000e+5000"
+    """
+    if not isinstance(value, int) or value.bit_length() <= MAX_EXACT_BITS:
+        return str(value)
+    
+    digits = int(value.bit_length() * LOG10_2)
+    # The estimate can be one digit short; fix it with integer arithmetic
+    if abs(value) >= 10 ** (digits + 1):
+        digits += 1
+    elif abs(value) < 10 ** digits:
+        digits -= 1
+    leading = abs(value) // 10 ** (digits - SCIENTIFIC_DIGITS)
+    mantissa = f"{leading // 10 ** SCIENTIFIC_DIGITS}.{leading % 10 ** SCIENTIFIC_DIGITS:0{SCIENTIFIC_DIGITS}d}"
+    return f"{'-' if value < 0 else ''}{mantissa}e+{digits}"
+
+
+class SafeCalculator:
+    """Evaluates arithmetic expressions within time and size budgets"""
+    
+    def __init__(self, timeout=None, max_exponent=None, max_factorial=None, max_result_bits=None):
+        """
+        Initialize the calculator
+        
+        Args:
+            timeout: Wall-clock budget per evaluation in seconds
+            max_exponent: Largest exponent allowed in a power
+            max_factorial: Largest factorial argument allowed
+            max_result_bits: Largest integer result size in bits
+        """
+        self.timeout = timeout if timeout is not None else config.CALC_TIMEOUT
+        self.max_exponent = max_exponent if max_exponent is not None else config.CALC_MAX_EXPONENT
+        self.max_factorial = max_factorial if max_factorial is not None else config.CALC_MAX_FACTORIAL
+        self.max_result_bits = max_result_bits if max_result_bits is not None else config.CALC_MAX_RESULT_BITS
+    
+    def evaluate(self, text: str):
+        """
+        Evaluate a spoken or written expression
+        
+        Args:
+            text: Expression text
+        
+        Returns:
+            Numeric result
+        """
+        expr = normalize_expression(text)
+        if not expr:
+            raise CalculationError("Empty expression")
+        
+        tree = compile_expression(expr)
+        deadline = time.monotonic() + self.timeout
+        return self._eval(tree, deadline)
+    
+    def _eval(self, node, deadline):
+        """Recursively evaluate a validated AST node"""
+        if time.monotonic() > deadline:
+            raise CalculationTooExpensive("Calculation took too long")
+        
+        if isinstance(node, ast.Constant):
+            return node.value
+        
+        if isinstance(node, ast.Name):
+            return CONSTANTS[node.id]
+        
+        if isinstance(node, ast.UnaryOp):
+            return UNARY_OPERATORS[type(node.op)](self._eval(node.operand, deadline))
+        
+        if isinstance(node, ast.BinOp):
+            left = self._eval(node.left, deadline)
+            right = self._eval(node.right, deadline)
+            op = type(node.op)
+            if op is ast.Pow:
+                self._check_power(left, right)
+            elif op is ast.Mult:
+                self._check_size(self._bits(left) + self._bits(right))
+            try:
+                result = BINARY_OPERATORS[op](left, right)
+            except (ZeroDivisionError, OverflowError, ValueError) as e:
+                raise CalculationError(str(e)) from e
+            # e.g. (-8) ** 0.5
+            if isinstance(result, complex):
+                raise CalculationError("Result is not a real number")
+            return result
+        
+        if isinstance(node, ast.Call):
+            name = node.func.id
+            args = [self._eval(arg, deadline) for arg in node.args]
+            if name == 'factorial' and args and args[0] > self.max_factorial:
+                raise CalculationTooExpensive(f"Factorial argument above {self.max_factorial}")
+            try:
+                return FUNCTIONS[name](*args)
+            except (TypeError, ValueError, OverflowError) as e:
+                raise CalculationError(str(e)) from e
+        
+        raise CalculationError(f"Unsupported element in expression: {type(node).__name__}")
+    
+    @staticmethod
+    def _bits(value) -> int:
+        """Approximate size of a number in bits"""
+        if isinstance(value, int):
+            return value.bit_length()
+        return 0
+    
+    def _check_size(self, bits: int):
+        """Reject integer results that would exceed the size budget"""
+        if bits > self.max_result_bits:
+            raise CalculationTooExpensive("Result would be too large")
+    
+    def _check_power(self, base, exponent):
+        """Reject powers whose result would be too expensive to compute"""
+        if abs(exponent) > self.max_exponent:
+            raise CalculationTooExpensive(f"Exponent above {self.max_exponent}")
+        if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+            self._check_size(max(abs(base), 1).bit_length() * exponent)
@@ -0,0 +1,297 @@
+"""
+Series Calculator Module
+Closed-form and vectorized answers for sums, products and means over ranges
+"""
+
+import re
+import math
+import logging
+from typing import Optional
+
+import config
+from safe_calculator import CalculationError, CalculationTooExpensive
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+NUMBER_WORDS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+    'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15,
+    'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+
+SCALE_WORDS = {
+    'thousand': 10 ** 3,
+    'million': 10 ** 6,
+    'billion': 10 ** 9,
+    'trillion': 10 ** 12,
+}
+
+SERIES_PATTERN = re.compile(
+    r'\b(?P<op>sum|total|product|mean|average)\s+of\s+(?:the\s+|all\s+)*'
+    r'(?P<kind>[a-z0-9\s]*?)\s*\b(?:'
+    r'from\s+(?P<start>.+?)\s+(?:to|through|until)\s+(?P<stop>.+?)|'
+    r'between\s+(?P<low>.+)\s+and\s+(?P<high>.+?)'
+    r')\s*[?.!]?$'
+)
+
+POWER_OF_BASE_PATTERN = re.compile(r'\bpowers\s+of\s+(\w+)')
+TO_POWER_PATTERN = re.compile(r'\bto\s+the\s+power\s+(?:of\s+)?(\w+)')
+
+# Rows per chunk when a series has to be reduced with NumPy
+VECTOR_CHUNK_SIZE = 1_000_000
+
+
+def parse_number(text: str) -> int:
+    """
+    Parse an integer written in digits or English words
+    
+    Args:
+        text: Number such as "10,000", "ten million" or "3 thousand"
+    
+    Returns:
+        Parsed integer
+    """
+    text = text.lower().replace(',', '').strip()
+    
+    # A leading "-" is the sign; other hyphens join compound words ("twenty-one")
+    negative = text.startswith('-')
+    words = text.lstrip('-').replace('-', ' ').split()
+    if not words:
+        raise CalculationError("Missing number")
+    
+    if not negative and words[0] in ('minus', 'negative'):
+        negative = True
+        words = words[1:]
+    
+    total = 0
+    current = 0
+    seen = False
+    for word in words:
+        if word in ('and', 'a'):
+            if word == 'a':
+                current = max(current, 1)
+            continue
+        if word.isdigit():
+            current += int(word)
+        elif word in NUMBER_WORDS:
+            current += NUMBER_WORDS[word]
+        elif word == 'hundred':
+            current = max(current, 1) * 100
+        elif word in SCALE_WORDS:
+            total += max(current, 1) * SCALE_WORDS[word]
+            current = 0
+        else:
+            raise CalculationError(f"Not a number: {text}")
+        seen = True
+    
+    if not seen:
+        raise CalculationError(f"Not a number: {text}")
+    
+    value = total + current
+    return -value if negative else value
+
+
+def power_sum(n: int, power: int) -> int:
+    """Closed-form sum of k**power for k = 1..n (power 0 to 3)"""
+    if n <= 0:
+        return 0
+    if power == 0:
+        return n
+    if power == 1:
+        return n * (n + 1) // 2
+    if power == 2:
+        return n * (n + 1) * (2 * n + 1) // 6
+    if power == 3:
+        return (n * (n + 1) // 2) ** 2
+    raise ValueError("No closed form for this power")
+
+
+def mean(total, count: int):
+    """
+    Mean of a series from its total
+    
+    Integer totals beyond the float range (about 1e308) cannot be divided
+    with /, so their mean is rounded to the nearest integer instead.
+    """
+    try:
+        return total / count
+    except OverflowError:
+        return (total + count // 2) // count
+
+
+class SeriesCalculator:
+    """Recognizes spoken series and evaluates them without Python loops"""
+    
+    def __init__(self, max_result_bits=None, max_terms=None):
+        """
+        Initialize the series calculator
+        
+        Args:
+            max_result_bits: Largest integer result size in bits
+            max_terms: Most terms reduced when no closed form applies
+        """
+        self.max_result_bits = max_result_bits if max_result_bits is not None else config.CALC_MAX_RESULT_BITS
+        self.max_terms = max_terms if max_terms is not None else config.CALC_MAX_SERIES_TERMS
+    
+    def evaluate(self, text: str) -> Optional[object]:
+        """
+        Evaluate a spoken series expression
+        
+        Args:
+            text: Text such as "sum of numbers from 1 to ten million"
+        
+        Returns:
+            Numeric result, or None if the text is not a series
+        """
+        match = SERIES_PATTERN.search(text.lower())
+        if not match:
+            return None
+        
+        op = match.group('op')
+        kind = match.group('kind')
+        if match.group('start') is not None:
+            start = parse_number(match.group('start'))
+            stop = parse_number(match.group('stop'))
+        else:
+            start = parse_number(match.group('low'))
+            stop = parse_number(match.group('high'))
+        if start > stop:
+            start, stop = stop, start
+        
+        step = 1
+        if re.search(r'\beven\b', kind):
+            start += start % 2
+            step = 2
+        elif re.search(r'\bodd\b', kind):
+            start += 1 - start % 2
+            step = 2
+        
+        if start > stop:
+            raise CalculationError("The range is empty")
+        count = (stop - start) // step + 1
+        stop = start + (count - 1) * step
+        
+        base_match = POWER_OF_BASE_PATTERN.search(kind)
+        if base_match:
+            return self._geometric(op, parse_number(base_match.group(1)), start, stop, step, count)
+        
+        power = 1
+        power_match = TO_POWER_PATTERN.search(kind)
+        if re.search(r'\bsquares?\b', kind):
+            power = 2
+        elif re.search(r'\bcubes?\b', kind):
+            power = 3
+        elif power_match:
+            power = parse_number(power_match.group(1))
+        if power < 0:
+            raise CalculationError("Negative powers are not supported")
+        
+        if op == 'product':
+            return self._product(start, stop, step, count, power)
+        
+        total = self._power_series_sum(start, stop, step, count, power)
+        if op in ('mean', 'average'):
+            return mean(total, count)
+        return total
+    
+    def _check_bits(self, bits: float):
+        """Reject results that would exceed the size budget"""
+        if bits > self.max_result_bits:
+            raise CalculationTooExpensive("Result would be too large")
+    
+    def _power_series_sum(self, start, stop, step, count, power):
+        """Sum of k**power over an arithmetic sequence"""
+        self._check_bits(max(abs(start), abs(stop), 1).bit_length() * power + count.bit_length())
+        
+        if power == 0:
+            return count
+        if power == 1:
+            # Arithmetic series: count * (first + last) / 2
+            return count * (start + stop) // 2
+        
+        if step == 1 and start >= 1 and power <= 3:
+            return power_sum(stop, power) - power_sum(start - 1, power)
+        
+        if step == 2 and start >= 1 and power <= 3:
+            # Even terms are 2**power * (1..m)**power; odd terms are the rest
+            evens = 2 ** power * (power_sum(stop // 2, power) - power_sum((start - 1) // 2, power))
+            everything = power_sum(stop, power) - power_sum(start - 1, power)
+            return evens if start % 2 == 0 else everything - evens
+        
+        return self._reduce(start, stop, step, count, power)
+    
+    def _reduce(self, start, stop, step, count, power):
+        """
+        Reduce a series with no closed form
+        
+        Vectorized with NumPy while int64 holds the total exactly; larger
+        totals are summed with exact Python integers within a work budget,
+        never in floating point.
+        """
+        if count > self.max_terms:
+            raise CalculationTooExpensive(f"More than {self.max_terms} terms without a closed form")
+        
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        
+        largest = max(abs(start), abs(stop))
+        term_bits = largest.bit_length() * power
+        if np is None or term_bits + count.bit_length() >= 63:
+            # Work grows with the size of the terms, counted in 64-bit words
+            if count * max(term_bits // 64, 1) > config.CALC_MAX_LOOP_TERMS:
+                raise CalculationTooExpensive("Series too long to sum exactly")
+            return sum(k ** power for k in range(start, stop + 1, step))
+        
+        total = 0
+        for chunk_start in range(start, stop + 1, VECTOR_CHUNK_SIZE * step):
+            chunk_stop = min(stop + 1, chunk_start + VECTOR_CHUNK_SIZE * step)
+            values = np.arange(chunk_start, chunk_stop, step, dtype=np.int64)
+            total += int((values ** power).sum())
+        return total
+    
+    def _geometric(self, op, base, start, stop, step, count):
+        """Sum, product or mean of base**k over the range"""
+        if start < 0:
+            raise CalculationError("Negative exponents are not supported")
+        
+        if op == 'product':
+            # base**start * base**(start + step) * ... = base**(sum of exponents)
+            exponent = count * (start + stop) // 2
+            self._check_bits(max(abs(base), 1).bit_length() * exponent)
+            return base ** exponent
+        
+        self._check_bits(max(abs(base), 1).bit_length() * (stop + 1))
+        ratio = base ** step
+        if ratio == 1:
+            total = base ** start * count
+        else:
+            total = base ** start * (ratio ** count - 1) // (ratio - 1)
+        
+        if op in ('mean', 'average'):
+            return mean(total, count)
+        return total
+    
+    def _product(self, start, stop, step, count, power):
+        """Product of k**power over the range"""
+        if start <= 0 <= stop:
+            return 0
+        
+        # Estimate the result size from log2 of every term before multiplying
+        high = max(abs(start), abs(stop))
+        bits = count * math.log2(high) * power if high > 1 else 0
+        self._check_bits(bits)
+        if count > self.max_terms:
+            raise CalculationTooExpensive(f"More than {self.max_terms} terms in product")
+        
+        if step == 1 and start > 0:
+            result = math.perm(stop, count)
+        else:
+            result = math.prod(range(start, stop + 1, step))
+        return result ** power
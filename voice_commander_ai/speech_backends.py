@@ -0,0 +1,257 @@
+"""
+Speech Backends Module
+Interchangeable speech-to-text engines for VoiceRecognizer
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Dict, Optional, Tuple, Type, Union
+
+import speech_recognition as sr
+
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SpeechBackend:
+    """Base class: turns AudioData into text"""
+    
+    name = 'base'
+    offline = False
+    
+    def load(self):
+        """Load models or other resources (called once, before first use)"""
+    
+    def recognize(self, recognizer: sr.Recognizer, audio: sr.AudioData) -> str:
+        """
+        Transcribe audio
+        
+        Args:
+            recognizer: The speech_recognition Recognizer
+            audio: Captured audio
+        
+        Returns:
+            Recognized text
+        
+        Raises:
+            sr.UnknownValueError: Speech was not understood
+            sr.RequestError: The engine is unavailable
+        """
+        raise NotImplementedError
+
+
+def resample_for_cloud(audio: sr.AudioData, sample_rate: Optional[int] = None) -> sr.AudioData:
+    """
+    Convert audio to the compact format cloud recognizers work best with
+    
+    Captured audio keeps the device's native rate (often 44.1 or 48 kHz),
+    and recognize_google FLAC-encodes whatever it is given. Speech models
+    only use the band below 8 kHz, so downsampling to 16 kHz 16-bit first
+    cuts the upload to about a third without hurting accuracy. AudioData
+    is always mono (stereo files are downmixed when read), and audio that
+    is already at or below the target rate is returned unchanged.
+    
+    Args:
+        audio: Captured audio
+        sample_rate: Target rate (default: config.CLOUD_SAMPLE_RATE)
+    
+    Returns:
+        AudioData at the target rate and 16-bit samples
+    """
+    sample_rate = sample_rate or config.CLOUD_SAMPLE_RATE
+    if audio.sample_rate <= sample_rate and audio.sample_width == 2:
+        return audio
+    rate = min(audio.sample_rate, sample_rate)
+    return sr.AudioData(audio.get_raw_data(convert_rate=rate, convert_width=2), rate, 2)
+
+
+class GoogleBackend(SpeechBackend):
+    """Google Web Speech API (needs network access)"""
+    
+    name = 'google'
+    
+    def __init__(self, language: str = 'en-US', resample: bool = True):
+        """
+        Args:
+            language: Recognition language
+            resample: Send 16 kHz audio instead of the native capture rate
+        """
+        self.language = language
+        self.resample = resample
+    
+    def recognize(self, recognizer, audio):
+        if self.resample:
+            audio = resample_for_cloud(audio)
+        return recognizer.recognize_google(audio, language=self.language)
+
+
+class SphinxBackend(SpeechBackend):
+    """
+    CMU PocketSphinx offline recognizer
+    
+    recognizer.recognize_sphinx() builds a new decoder, reading the
+    acoustic model, language model and dictionary from disk, for every
+    phrase. The decoder is created once in load() instead and reused for
+    every utterance.
+    """
+    
+    name = 'sphinx'
+    offline = True
+    sample_rate = 16000
+    
+    def __init__(self, language: Union[str, Tuple[str, str, str]] = 'en-US'):
+        """
+        Args:
+            language: Language tag of the data bundled with speech_recognition,
+                or (acoustic model directory, language model file, dictionary file)
+        """
+        self.language = language
+        self.decoder = None
+        self._lock = threading.Lock()
+    
+    def _model_paths(self) -> Tuple[str, str, str]:
+        if not isinstance(self.language, str):
+            return tuple(self.language)
+        directory = os.path.join(os.path.dirname(os.path.realpath(sr.__file__)),
+                                 'pocketsphinx-data', self.language)
+        if not os.path.isdir(directory):
+            raise sr.RequestError(f"missing PocketSphinx language data directory: \"{directory}\"")
+        return (os.path.join(directory, 'acoustic-model'),
+                os.path.join(directory, 'language-model.lm.bin'),
+                os.path.join(directory, 'pronounciation-dictionary.dict'))
+    
+    def load(self):
+        if self.decoder is not None:
+            return
+        try:
+            from pocketsphinx import pocketsphinx
+        except ImportError:
+            raise sr.RequestError("missing PocketSphinx module: ensure that PocketSphinx is set up correctly.")
+        
+        acoustic_model, language_model, dictionary = self._model_paths()
+        if not os.path.isdir(acoustic_model):
+            raise sr.RequestError(f"missing PocketSphinx acoustic model directory: \"{acoustic_model}\"")
+        for path in (language_model, dictionary):
+            if not os.path.isfile(path):
+                raise sr.RequestError(f"missing PocketSphinx model file: \"{path}\"")
+        
+        decoder_config = pocketsphinx.Config()
+        decoder_config.set_string('-hmm', acoustic_model)
+        decoder_config.set_string('-lm', language_model)
+        decoder_config.set_string('-dict', dictionary)
+        decoder_config.set_string('-logfn', os.devnull)
+        self.decoder = pocketsphinx.Decoder(decoder_config)
+        logger.info(f"Loaded PocketSphinx model from {acoustic_model}")
+    
+    def recognize(self, recognizer, audio):
+        self.load()
+        raw = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+        # One decoder holds one utterance at a time
+        with self._lock:
+            self.decoder.start_utt()
+            self.decoder.process_raw(raw, False, True)
+            self.decoder.end_utt()
+            hypothesis = self.decoder.hyp()
+        if hypothesis is None or not hypothesis.hypstr:
+            raise sr.UnknownValueError()
+        return hypothesis.hypstr
+
+
+class VoskBackend(SpeechBackend):
+    """
+    Vosk (Kaldi) offline recognizer
+    
+    The model is loaded once in load() and shared by every utterance;
+    only a lightweight KaldiRecognizer is created per phrase.
+    """
+    
+    name = 'vosk'
+    offline = True
+    sample_rate = 16000
+    
+    def __init__(self, model_path: str = None):
+        self.model_path = model_path or config.VOSK_MODEL_PATH
+        self.model = None
+        self._vosk = None
+    
+    def load(self):
+        if self.model is not None:
+            return
+        try:
+            import vosk
+        except ImportError:
+            raise sr.RequestError("missing vosk module: install it with 'pip install vosk'")
+        if not os.path.isdir(self.model_path):
+            raise sr.RequestError(f"Vosk model not found at {self.model_path}")
+        
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model = vosk.Model(self.model_path)
+        logger.info(f"Loaded Vosk model from {self.model_path}")
+    
+    def recognize(self, recognizer, audio):
+        self.load()
+        decoder = self._vosk.KaldiRecognizer(self.model, self.sample_rate)
+        decoder.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(decoder.FinalResult()).get('text', '')
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+BACKENDS: Dict[str, Type[SpeechBackend]] = {
+    'google': GoogleBackend,
+    'sphinx': SphinxBackend,
+    'vosk': VoskBackend,
+}
+
+
+def create_backend(name: str = None) -> SpeechBackend:
+    """
+    Create a speech backend by name
+    
+    Args:
+        name: Backend name (default: config.STT_BACKEND)
+    
+    Returns:
+        Backend instance (not loaded yet)
+    """
+    name = (name or config.STT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown speech backend '{name}' (choose from {', '.join(BACKENDS)})")
+    if name == 'vosk':
+        return VoskBackend()
+    return BACKENDS[name](language=config.STT_LANGUAGE)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Word error rate of a transcript
+    
+    Args:
+        reference: Expected transcript
+        hypothesis: Recognized transcript
+    
+    Returns:
+        (substitutions + deletions + insertions) / reference words
+    """
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return float(bool(hyp))
+    
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            ))
+        previous = current
+    return previous[-1] / len(ref)
@@ -0,0 +1,102 @@
+"""
+Startup Timing Module
+Breaks startup time down into imports and component initialization
+"""
+
+import sys
+import time
+import importlib
+import logging
+from contextlib import contextmanager
+from typing import Optional
+
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """Records how long each import and component took during startup"""
+    
+    def __init__(self, origin: Optional[float] = None, verbose: bool = False,
+                 budget: Optional[float] = None):
+        """
+        Initialize the report
+        
+        Args:
+            origin: perf_counter() value startup is measured from (default: now)
+            verbose: Print the breakdown when startup finishes
+            budget: Startup budget in seconds (default: config.STARTUP_BUDGET_SECONDS)
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self.verbose = verbose
+        self.budget = config.STARTUP_BUDGET_SECONDS if budget is None else budget
+        self.entries = []
+        self.finished_at = None
+    
+    def record(self, kind: str, name: str, seconds: float):
+        """Add a measured step"""
+        self.entries.append((kind, name, seconds))
+    
+    @contextmanager
+    def measure(self, name: str, kind: str = 'init'):
+        """Time the enclosed block as a startup step"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.perf_counter() - start)
+    
+    def import_module(self, name: str):
+        """
+        Import a module, timing it if this is the first import
+        
+        Args:
+            name: Module name
+        
+        Returns:
+            The module
+        """
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        with self.measure(name, kind='import'):
+            return importlib.import_module(name)
+    
+    @property
+    def total(self) -> float:
+        """Seconds from the origin to finish() (or to now)"""
+        return (self.finished_at or time.perf_counter()) - self.origin
+    
+    def finish(self):
+        """Mark startup as complete, warn if over budget and print the report if verbose"""
+        if self.finished_at is None:
+            self.finished_at = time.perf_counter()
+        if self.budget and self.total > self.budget:
+            logger.warning(f"Startup took {self.total:.2f}s, over the {self.budget:.2f}s budget "
+                           f"(run with --startup-report for details)")
+        if self.verbose:
+            self.print_report()
+    
+    def as_dict(self) -> dict:
+        return {
+            'total_seconds': self.total,
+            'budget_seconds': self.budget,
+            'steps': [{'kind': kind, 'name': name, 'seconds': seconds}
+                      for kind, name, seconds in self.entries],
+        }
+    
+    def print_report(self, file=None):
+        """Print the startup breakdown, slowest steps first"""
+        file = file or sys.stderr
+        print("\n" + "="*50, file=file)
+        print("⏱️  STARTUP TIME", file=file)
+        print("="*50, file=file)
+        for kind, name, seconds in sorted(self.entries, key=lambda entry: -entry[2]):
+            print(f"{kind:<8}{name:<30}{seconds * 1000:>10.1f} ms", file=file)
+        measured = sum(seconds for _, _, seconds in self.entries)
+        print(f"{'other':<38}{(self.total - measured) * 1000:>10.1f} ms", file=file)
+        status = "over budget" if self.budget and self.total > self.budget else "within budget"
+        print(f"{'total':<38}{self.total * 1000:>10.1f} ms ({status}: {self.budget:.2f}s)", file=file)
+        print("="*50 + "\n", file=file)
@@ -0,0 +1,31 @@
+"""
+Tests for the API integrations
+Batch commands reach the integrations with their original text
+"""
+
+import pytest
+
+from api_integrations import IntegratedVoiceAI, WeatherIntegration, remove_words
+
+
+@pytest.mark.parametrize("text, words, expected", [
+    ("weather in Paris", ('weather', 'in'), "Paris"),
+    ("Weather in Berlin", ('weather', 'in'), "Berlin"),
+    ("search wikipedia for Ada Lovelace", ('wikipedia', 'search'), "for Ada Lovelace"),
+    ("weather", ('weather', 'in'), ""),
+])
+def test_remove_words(text, words, expected):
+    assert remove_words(text, *words) == expected
+
+
+def test_batch_and_single_commands_get_the_same_arguments(monkeypatch):
+    monkeypatch.setattr(WeatherIntegration, 'get_weather', lambda self, city: f"Weather for {city}")
+    ai = IntegratedVoiceAI(discover_plugins=False)
+    
+    assert ai.handle_command("weather in New York") == "Weather for New York"
+    results = list(ai.handle_commands(["Weather in New York", "weather in Berlin", "hello"]))
+    assert results == [
+        ("Weather in New York", 'weather', "Weather for New York"),
+        ("weather in Berlin", 'weather', "Weather for Berlin"),
+        ("hello", None, None),
+    ]
@@ -0,0 +1,62 @@
+"""
+Tests for batch transcription
+Backend failures reported per file, or up front when the backend cannot load
+"""
+
+import wave
+
+import pytest
+import speech_recognition as sr
+
+import batch_transcribe
+
+
+class FailingBackend:
+    def recognize(self, recognizer, audio):
+        raise RuntimeError("decoder crashed")
+
+
+@pytest.fixture
+def wav_file(tmp_path):
+    path = tmp_path / "clip.wav"
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(b'\0\0' * 1600)
+    return str(path)
+
+
+def test_engine_exception_is_recorded_as_an_error(wav_file, monkeypatch):
+    monkeypatch.setattr(batch_transcribe, '_worker', {
+        'sr': sr,
+        'recognizer': sr.Recognizer(),
+        'backend': FailingBackend(),
+    })
+    result = batch_transcribe._transcribe(wav_file)
+    assert result['status'] == 'error'
+    assert result['error'] == "decoder crashed"
+
+
+def test_backend_that_cannot_load_fails_before_the_pool(wav_file, tmp_path, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("pool started")
+    
+    def load(self):
+        raise sr.RequestError("model not found")
+    
+    monkeypatch.setattr(batch_transcribe, 'ProcessPoolExecutor', no_pool)
+    monkeypatch.setattr('speech_backends.VoskBackend.load', load)
+    with pytest.raises(sr.RequestError, match="model not found"):
+        batch_transcribe.transcribe_batch([(wav_file, None)], str(tmp_path / "out.jsonl"),
+                                          backend='vosk')
+
+
+def test_main_reports_a_backend_that_cannot_load(wav_file, tmp_path, monkeypatch, capsys):
+    def load(self):
+        raise sr.RequestError("model not found")
+    
+    monkeypatch.setattr('speech_backends.VoskBackend.load', load)
+    code = batch_transcribe.main([wav_file, '-o', str(tmp_path / "out.jsonl"), '--backend', 'vosk'])
+    assert code == 2
+    assert "model not found" in capsys.readouterr().err
@@ -0,0 +1,73 @@
+"""
+Tests for command matching
+Ranking of keyword hits and rebuilding the matcher after the table changes
+"""
+
+from command_matcher import CommandMatcher, CommandTable, tokenize
+
+
+def test_tokenize():
+    assert tokenize("What's the Time, please?") == ["what's", 'the', 'time', 'please']
+
+
+def test_longer_phrase_wins():
+    matcher = CommandMatcher(['time', 'date'], {'date': ['what is today']})
+    assert matcher.best("what is today") == 'date'
+    assert matcher.best("time and date") == 'time'
+
+
+def test_own_keyword_beats_a_synonym_of_the_same_length():
+    matcher = CommandMatcher(['search', 'open'], {'open': ['search']})
+    assert matcher.best("search cats") == 'search'
+
+
+def test_ties_go_to_the_first_registered_command():
+    matcher = CommandMatcher(['open', 'search'], {'open': ['find'], 'search': ['look']})
+    ranked = matcher.rank("look and find")
+    assert [match.command for match in ranked] == ['open', 'search']
+    assert ranked[1].position == 0
+
+
+def test_synonyms_of_unknown_commands_are_ignored():
+    matcher = CommandMatcher(['time'], {'weather': ['forecast']})
+    assert matcher.best("forecast") is None
+    assert matcher.find_all("") == []
+
+
+def test_table_version_changes_on_every_mutation():
+    table = CommandTable({'time': None})
+    versions = [table.version]
+    table['date'] = None
+    table.update(help=None)
+    table.setdefault('bye')
+    table.pop('bye')
+    del table['help']
+    versions.append(table.version)
+    assert versions == [0, 5]
+    table.setdefault('time')
+    assert table.version == 5
+
+
+def test_brain_matcher_is_rebuilt_after_a_table_change():
+    from advanced_ai_brain import AdvancedAIBrain
+    brain = AdvancedAIBrain()
+    assert brain.match_command("play some jazz") is None
+    matcher = brain._get_matcher()
+    
+    brain.add_custom_command('play', lambda text: f"Playing {text}")
+    assert brain._matcher is matcher
+    assert brain.process_command("play some jazz") == "Playing play some jazz"
+    assert brain._matcher is not matcher
+    
+    del brain.commands['play']
+    assert brain.match_command("play some jazz") is None
+
+
+def test_batch_handlers_get_the_original_text():
+    from ai_brain import AIBrain
+    brain = AIBrain()
+    seen = []
+    brain.commands['search'] = lambda text: seen.append(text) or "ok"
+    results = list(brain.process_commands(["  Search for Python Docs ", "Search NASA"]))
+    assert [command for _, command, _ in results] == ['search', 'search']
+    assert seen == ["  Search for Python Docs ", "Search NASA"]
@@ -0,0 +1,57 @@
+"""
+Tests for command scoring
+Batch scoring matches single scoring, and NumPy is only loaded for batches
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+import config
+from command_scorer import CommandScorer
+
+TEXTS = ["what time is it", "search for the weather forecast", "goodbye", "", "open spotify now"]
+
+
+@pytest.fixture
+def scorer():
+    return CommandScorer(config.VOICE_COMMANDS.keys(), config.VOICE_COMMANDS)
+
+
+def test_scores(scorer):
+    assert scorer.top_k("what time is it", k=1) == [('time', 1.0)]
+    assert scorer.score("tell me the time", 'time') == 1.0
+    assert scorer.scores("") == {}
+
+
+def assert_same_ranking(batch, single):
+    assert [[command for command, _ in ranked] for ranked in batch] == \
+        [[command for command, _ in ranked] for ranked in single]
+    # The matrix is float32
+    assert [[score for _, score in ranked] for ranked in batch] == \
+        [pytest.approx([score for _, score in ranked], rel=1e-6) for ranked in single]
+
+
+def test_batch_matches_single_scoring(scorer):
+    assert_same_ranking(list(scorer.top_k_many(TEXTS, chunk_size=2)), [scorer.top_k(text) for text in TEXTS])
+
+
+def test_batch_without_numpy(scorer, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    assert_same_ranking(list(scorer.top_k_many(TEXTS)), [scorer.top_k(text) for text in TEXTS])
+    assert scorer.matrix is None
+
+
+def test_matrix_is_built_on_first_batch():
+    pytest.importorskip('numpy')
+    code = (
+        "import sys, config\n"
+        "from command_scorer import CommandScorer\n"
+        "scorer = CommandScorer(config.VOICE_COMMANDS.keys(), config.VOICE_COMMANDS)\n"
+        "scorer.top_k('what time is it')\n"
+        "assert scorer.matrix is None and 'numpy' not in sys.modules\n"
+        "list(scorer.top_k_many(['what time is it']))\n"
+        "assert scorer.matrix is not None and 'numpy' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=config.__file__.rsplit('/', 1)[0])
@@ -0,0 +1,57 @@
+"""
+Tests for the main application loop
+Serial traces record how each utterance ended, like the pipelined loop
+"""
+
+import json
+
+import config
+from main import VoiceCommanderAI
+from tracing import Tracer
+
+
+class StubRecognizer:
+    def __init__(self, commands):
+        self.commands = list(commands)
+    
+    def listen(self):
+        return self.commands.pop(0)
+
+
+class StubSpeaker:
+    is_speaking = False
+    
+    def __init__(self):
+        self.spoken = []
+    
+    def speak(self, text):
+        self.spoken.append(text)
+    
+    speak_async = speak
+
+
+class StubBrain:
+    def process_command(self, text):
+        return None if text == "mumble" else f"answer to {text}"
+
+
+def test_serial_traces_record_status(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(config, 'TTS_NON_BLOCKING', False)
+    app = VoiceCommanderAI()
+    app.tracer = Tracer(path=str(tmp_path / "traces.jsonl"))
+    app._recognizer = StubRecognizer([None, "mumble", "hello", "bye"])
+    app._speaker = StubSpeaker()
+    app._brain = StubBrain()
+    
+    app.run_serial()
+    app.tracer.close()
+    
+    with open(tmp_path / "traces.jsonl") as f:
+        traces = [json.loads(line) for line in f]
+    assert [trace['attrs'] for trace in traces] == [
+        {'mode': 'serial', 'status': 'unrecognized'},
+        {'mode': 'serial', 'status': 'no_response'},
+        {'mode': 'serial', 'status': 'spoken'},
+        {'mode': 'serial', 'status': 'spoken'},
+    ]
+    assert app._speaker.spoken == ["answer to hello", "answer to bye", "Goodbye! Have a great day!"]
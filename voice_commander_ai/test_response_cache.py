@@ -0,0 +1,56 @@
+"""
+Tests for response caching
+Policies apply only to the built-in handlers they were written for
+"""
+
+from itertools import count
+
+from ai_brain import AIBrain
+from response_cache import LRUCache, ResponseCache, pure
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.stats()['hits'] == 1
+
+
+def test_pure_policy_caches_the_response():
+    calls = count()
+    cache = ResponseCache({'help': pure()})
+    assert cache.call('help', lambda text: next(calls), "help") == 0
+    assert cache.call('help', lambda text: next(calls), "help me") == 0
+
+
+def test_builtin_handler_is_cached():
+    brain = AIBrain()
+    assert brain.process_command("help") == brain.process_command("help")
+    assert brain.cache_stats()['hits'] == 1
+
+
+def test_replaced_handler_is_not_cached():
+    brain = AIBrain()
+    brain.process_command("help")
+    calls = count()
+    brain.commands['help'] = lambda text: f"dynamic {next(calls)}"
+    assert brain.process_command("help") == "dynamic 0"
+    assert brain.process_command("help") == "dynamic 1"
+    
+    # Putting the built-in handler back restores its policy
+    brain.commands['help'] = brain.show_help
+    brain.process_command("help")
+    brain.process_command("help")
+    assert brain.cache_stats()['hits'] == 1
+    assert 'help' in brain.response_cache.policies
+
+
+def test_replaced_handler_is_not_cached_in_batches():
+    brain = AIBrain()
+    calls = count()
+    brain.commands['bye'] = lambda text: f"bye {next(calls)}"
+    responses = [response for _, _, response in brain.process_commands(["bye", "bye"])]
+    assert responses == ["bye 0", "bye 1"]
@@ -0,0 +1,104 @@
+"""
+Tests for response streaming
+A local server-sent events endpoint stands in for the chat completions API
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import config
+from response_streaming import split_sentences, stream_chat_completion
+
+TOKENS = ["Hello", " there.", " The answer", " is 3.14", " today."]
+
+
+@pytest.fixture
+def sse_server(monkeypatch):
+    """Serve TOKENS as a streamed completion, holding back all but the first until released"""
+    state = {'release': threading.Event(), 'finished': threading.Event(), 'requests': []}
+    
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+        
+        def send_event(self, data):
+            self.wfile.write(f"data: {data}\n\n".encode('utf-8'))
+        
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            state['requests'].append({'path': self.path, 'body': json.loads(body),
+                                      'auth': self.headers['Authorization']})
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            self.wfile.write(b": keep-alive\n\n")
+            for index, token in enumerate(TOKENS):
+                if index == 1:
+                    state['release'].wait(5)
+                self.send_event(json.dumps({'choices': [{'delta': {'content': token}}]}))
+            self.send_event(json.dumps({'choices': [{'delta': {}, 'finish_reason': 'stop'}]}))
+            self.send_event('[DONE]')
+            state['finished'].set()
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_port}/v1"
+    monkeypatch.setenv('OPENAI_API_BASE', base)
+    monkeypatch.setattr(config, 'OPENAI_API_BASE', base)
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    yield state
+    state['release'].set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_tokens_are_yielded_as_they_arrive(sse_server):
+    stream = stream_chat_completion([{'role': 'user', 'content': 'hi'}], timeout=5)
+    # The server holds the rest back until the first token has been received
+    assert next(stream) == "Hello"
+    assert not sse_server['finished'].is_set()
+    sse_server['release'].set()
+    assert list(stream) == TOKENS[1:]
+    
+    request, = sse_server['requests']
+    assert request['path'] == '/v1/chat/completions'
+    assert request['body']['stream'] is True
+    assert request['auth'] == 'Bearer test-key'
+
+
+def test_sentences_split_across_fragments():
+    fragments = ["Dr. Smith", " paid 3.", "50 dollars", ". Then", " he left!", " Bye"]
+    assert list(split_sentences(fragments)) == [
+        "Dr. Smith paid 3.50 dollars.",
+        "Then he left!",
+        "Bye",
+    ]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("It costs approx. 5 euros. Cheap.", ["It costs approx. 5 euros.", "Cheap."]),
+    ("Pi is 3.14 or so. Really?", ["Pi is 3.14 or so.", "Really?"]),
+    ('He said "stop." Then left.', ['He said "stop."', "Then left."]),
+    ("Wait... what?! ok", ["Wait...", "what?!", "ok"]),
+    ("   ", []),
+])
+def test_split_sentences(text, expected):
+    assert list(split_sentences(iter(text))) == expected
+
+
+def test_streamed_answer_is_recorded_in_history(sse_server):
+    from advanced_ai_brain import AdvancedAIBrain
+    brain = AdvancedAIBrain()
+    brain.use_openai = True
+    sse_server['release'].set()
+    
+    assert ''.join(brain.generate_response_stream("what is pi")) == ''.join(TOKENS)
+    assert brain.conversation_history.messages()[-2:] == [
+        {'role': 'user', 'content': "what is pi"},
+        {'role': 'assistant', 'content': ''.join(TOKENS)},
+    ]
+    assert sse_server['requests'][0]['body']['messages'][-1] == {'role': 'user', 'content': "what is pi"}
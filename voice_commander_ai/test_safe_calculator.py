@@ -0,0 +1,64 @@
+"""
+Tests for the safe calculator
+Inputs that must be answered or rejected without uncaught exceptions
+"""
+
+import pytest
+
+from safe_calculator import (CalculationError, CalculationTooExpensive, SafeCalculator,
+                             compile_expression, format_number)
+
+
+@pytest.fixture
+def calculator():
+    return SafeCalculator()
+
+
+def test_spoken_arithmetic(calculator):
+    assert calculator.evaluate("5 times 3 plus 2") == 17
+    assert calculator.evaluate("sqrt(16)") == 4.0
+    assert calculator.evaluate("factorial(5)") == 120
+
+
+def test_bare_function_name_is_rejected(calculator):
+    with pytest.raises(CalculationError):
+        calculator.evaluate("sqrt")
+    with pytest.raises(CalculationError):
+        compile_expression("sqrt + 1")
+
+
+def test_constant_is_not_callable(calculator):
+    with pytest.raises(CalculationError):
+        calculator.evaluate("pi(2)")
+
+
+def test_complex_results_are_rejected(calculator):
+    with pytest.raises(CalculationError):
+        calculator.evaluate("(-8)**0.5")
+    with pytest.raises(CalculationError):
+        calculator.evaluate("factorial((-8)**0.5)")
+
+
+def test_factorial_limit(calculator):
+    with pytest.raises(CalculationTooExpensive):
+        calculator.evaluate(f"factorial({calculator.max_factorial + 1})")
+
+
+def test_format_number_keeps_short_integers_exact():
+    assert format_number(2 ** 100) == str(2 ** 100)
+    assert format_number(1.5) == "1.5"
+
+
+def test_format_number_uses_scientific_notation_for_long_integers():
+    # Longer than Python's 4300-digit limit for str(int)
+    assert format_number(10 ** 5000) == "1.0000000000e+5000"
+    assert format_number(10 ** 5000 - 1) == "9.9999999999e+4999"
+    assert format_number(-(10 ** 5000)) == "-1.0000000000e+5000"
+
+
+def test_large_results_are_answered():
+    from ai_brain import AIBrain
+    brain = AIBrain()
+    assert brain.process_command("calculate 10**5000") == "The answer is 1.0000000000e+5000"
+    assert brain.process_command("calculate product of numbers from 1 to 3000").startswith("The answer is 4.1493596034e+9130")
+    assert brain.process_command("calculate sqrt") == "Could not calculate that expression"
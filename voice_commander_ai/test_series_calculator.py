@@ -0,0 +1,71 @@
+"""
+Tests for the series calculator
+Spoken ranges with negative bounds and results beyond the float range
+"""
+
+import pytest
+
+from safe_calculator import CalculationError, CalculationTooExpensive
+from series_calculator import SeriesCalculator, parse_number
+
+
+@pytest.fixture
+def series():
+    return SeriesCalculator()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("5", 5),
+    ("-5", -5),
+    ("minus five", -5),
+    ("twenty-one", 21),
+    ("-twenty-one", -21),
+    ("ten thousand", 10000),
+    ("1,000", 1000),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+
+def test_parse_number_rejects_words():
+    with pytest.raises(CalculationError):
+        parse_number("lots")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("sum of numbers from 1 to 100", 5050),
+    ("sum of numbers from -5 to 5", 0),
+    ("sum of numbers from -10 to -1", -55),
+    ("sum of squares from -3 to 3", 28),
+    ("product of numbers from -3 to -1", -6),
+    ("mean of numbers from -4 to 2", -1.0),
+])
+def test_negative_ranges(series, text, expected):
+    assert series.evaluate(text) == expected
+
+
+def test_mean_beyond_float_range(series):
+    total = 2 ** 2001 - 2
+    assert series.evaluate("mean of powers of 2 from 1 to 2000") == (total + 1000) // 2000
+
+
+def test_mean_in_float_range(series):
+    assert series.evaluate("mean of numbers from 1 to 4") == 2.5
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("sum of numbers to the power 1000 from 1 to 10", sum(k ** 1000 for k in range(1, 11))),
+    ("sum of numbers to the power 30 from 1 to 100", sum(k ** 30 for k in range(1, 101))),
+])
+def test_sums_beyond_int64_are_exact(series, text, expected):
+    assert series.evaluate(text) == expected
+
+
+def test_mean_of_large_powers_is_finite(series):
+    total = sum(k ** 200 for k in range(1, 51))
+    assert series.evaluate("mean of numbers to the power 200 from 1 to 50") == (total + 25) // 50
+
+
+def test_exact_sum_over_budget_is_refused():
+    with pytest.raises(CalculationTooExpensive):
+        SeriesCalculator(max_terms=10 ** 9).evaluate("sum of numbers to the power 100 from 1 to 2000000")
@@ -0,0 +1,80 @@
+"""
+Tests for the speech backends
+The PocketSphinx decoder is built once and reused for every utterance
+"""
+
+import sys
+import types
+
+import pytest
+import speech_recognition as sr
+
+from speech_backends import SphinxBackend
+
+
+class StubDecoder:
+    created = 0
+    
+    def __init__(self, config):
+        StubDecoder.created += 1
+        self.config = config
+        self.utterances = []
+    
+    def start_utt(self):
+        self.utterances.append(b'')
+    
+    def process_raw(self, raw, no_search, full_utt):
+        self.utterances[-1] += raw
+    
+    def end_utt(self):
+        pass
+    
+    def hyp(self):
+        if not any(self.utterances[-1]):
+            return None
+        return types.SimpleNamespace(hypstr="turn on the lights")
+
+
+class StubConfig(dict):
+    def set_string(self, key, value):
+        self[key] = value
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    module = types.ModuleType('pocketsphinx')
+    module.pocketsphinx = types.SimpleNamespace(Config=StubConfig, Decoder=StubDecoder)
+    monkeypatch.setitem(sys.modules, 'pocketsphinx', module)
+    StubDecoder.created = 0
+    
+    (tmp_path / "acoustic-model").mkdir()
+    (tmp_path / "model.lm.bin").write_bytes(b'')
+    (tmp_path / "model.dict").write_text('')
+    return (str(tmp_path / "acoustic-model"), str(tmp_path / "model.lm.bin"),
+            str(tmp_path / "model.dict"))
+
+
+def test_decoder_is_created_once(model):
+    backend = SphinxBackend(language=model)
+    backend.load()
+    speech = sr.AudioData(b'\x01\x02' * 1600, 16000, 2)
+    silence = sr.AudioData(b'\0\0' * 1600, 16000, 2)
+    
+    assert backend.recognize(sr.Recognizer(), speech) == "turn on the lights"
+    with pytest.raises(sr.UnknownValueError):
+        backend.recognize(sr.Recognizer(), silence)
+    assert backend.recognize(sr.Recognizer(), speech) == "turn on the lights"
+    assert StubDecoder.created == 1
+    assert backend.decoder.config['-hmm'] == model[0]
+
+
+def test_missing_model_file_fails_on_load(model):
+    backend = SphinxBackend(language=(model[0], model[1], model[2] + '.missing'))
+    with pytest.raises(sr.RequestError, match="model file"):
+        backend.load()
+
+
+def test_missing_module_fails_on_load(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pocketsphinx', None)
+    with pytest.raises(sr.RequestError, match="missing PocketSphinx module"):
+        SphinxBackend().load()
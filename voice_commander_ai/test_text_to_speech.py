@@ -0,0 +1,94 @@
+"""
+Tests for the speech worker
+A stub pyttsx3 engine stands in for the speech driver
+"""
+
+import sys
+import time
+import types
+import threading
+
+import pytest
+
+import config
+
+
+class StubEngine:
+    """Records what was spoken; takes 10 ms per word and honours stop()"""
+    
+    def __init__(self):
+        self.queued = []
+        self.spoken = []
+        self.callbacks = []
+        self.stopped = False
+        self.started = threading.Event()
+    
+    def setProperty(self, name, value):
+        pass
+    
+    def getProperty(self, name):
+        return []
+    
+    def connect(self, topic, callback):
+        self.callbacks.append(callback)
+    
+    def say(self, text):
+        self.queued.append(text)
+    
+    def save_to_file(self, text, path):
+        pass
+    
+    def runAndWait(self):
+        self.stopped = False
+        for text in self.queued:
+            self.started.set()
+            words = []
+            for index, word in enumerate(text.split()):
+                for callback in self.callbacks:
+                    callback('started-word', index, len(word))
+                if self.stopped:
+                    break
+                words.append(word)
+                time.sleep(0.01)
+            self.spoken.append(' '.join(words))
+        self.queued = []
+    
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def tts(monkeypatch, tmp_path):
+    engine = StubEngine()
+    monkeypatch.setitem(sys.modules, 'pyttsx3', types.SimpleNamespace(init=lambda: engine))
+    monkeypatch.setattr(config, 'TTS_CACHE_ENABLED', False)
+    from text_to_speech import TextToSpeech
+    speaker = TextToSpeech(cache_dir=str(tmp_path))
+    yield speaker
+    speaker.close(timeout=2)
+
+
+def test_speak_stream_speaks_every_sentence(tts):
+    assert tts.speak_stream(["One. Two", ". Three."]) == "One. Two. Three."
+    assert tts.engine.spoken == ["One.", "Two.", "Three."]
+
+
+def test_cancel_ends_a_streamed_answer(tts):
+    read_after_cancel = []
+    
+    def fragments():
+        yield "Sentence one is spoken. "
+        tts.engine.started.wait(2)
+        tts.cancel()
+        yield "Sentence two. "
+        read_after_cancel.append(True)
+        yield "Sentence three. Sentence four. Sentence five."
+        read_after_cancel.append(True)
+    
+    spoken = tts.speak_stream(fragments())
+    
+    assert spoken == "Sentence one is spoken."
+    assert not read_after_cancel
+    assert all('two' not in text and 'four' not in text and 'five' not in text
+               for text in tts.engine.spoken)
+    assert not tts.is_speaking
@@ -3,51 +3,329 @@ Text-to-Speech Module
 Handles speech synthesis for AI responses
 """
 
-import pyttsx3
+import queue
+import threading
 import logging
+from collections import deque
+
+import config
+from response_streaming import split_sentences
+from tts_cache import AudioCache, WavPlayer, cache_key
+from tracing import span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_STOP = object()
+
+
+class _SpeechItem:
+    """A queued utterance"""
+    
+    def __init__(self, text, generation):
+        self.text = text
+        self.generation = generation
+        self.done = threading.Event()
+
 
 class TextToSpeech:
     """Handles voice output"""
     
-    def __init__(self, rate=150, volume=0.9):
+    def __init__(self, rate=150, volume=0.9, queue_size=None, cache_dir=None):
         """
         Initialize text-to-speech engine
         
+        The engine lives on a dedicated speech worker thread fed by a
+        bounded queue, so callers never block on audio unless they ask to.
+        Frequent utterances are rendered to an on-disk audio cache while
+        the worker is idle and then played straight from file.
+        
         Args:
             rate: Speech rate (default 150 words per minute)
             volume: Volume level (0.0 to 1.0)
+            queue_size: Maximum pending utterances (default: config.TTS_QUEUE_SIZE)
+            cache_dir: Audio cache directory (default: config.TTS_CACHE_DIR)
         """
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', rate)
-        self.engine.setProperty('volume', volume)
+        self.rate = rate
+        self.volume = volume
+        self.engine = None
+        self.voice_id = None
+        self.queue = queue.Queue(maxsize=queue_size or config.TTS_QUEUE_SIZE)
+        
+        self.audio_cache = None
+        if config.TTS_CACHE_ENABLED:
+            try:
+                self.audio_cache = AudioCache(cache_dir or config.TTS_CACHE_DIR, config.TTS_CACHE_MAX_BYTES)
+            except OSError as e:
+                logger.warning(f"Speech audio cache disabled: {e}")
+        self.player = WavPlayer()
+        self._render_backlog = deque()
+        self._use_counts = {}
+        self._stop_playback = threading.Event()
+        self._rendering = False
+        
+        self._generation = 0
+        self._pending = 0
+        self._current = None
+        self._idle = threading.Condition()
+        self._ready = threading.Event()
+        self._init_error = None
+        
+        self._worker = threading.Thread(target=self._run_worker, name="tts-worker", daemon=True)
+        self._worker.start()
+        self._ready.wait()
+        if self._init_error is not None:
+            raise self._init_error
+    
+    def _init_engine(self):
+        """Create and configure the engine (on the worker thread)"""
+        # Imported here so that loading this module does not load the speech driver
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty('rate', self.rate)
+        engine.setProperty('volume', self.volume)
         
         # Set voice (optional: select male or female voice)
-        voices = self.engine.getProperty('voices')
+        voices = engine.getProperty('voices')
         if voices:
-            self.engine.setProperty('voice', voices[0].id)
+            engine.setProperty('voice', voices[0].id)
+            self.voice_id = voices[0].id
+        
+        # Stopping from inside the engine loop is the reliable way to cut an
+        # utterance short, so cancel() is honoured at the next word
+        if hasattr(engine, 'connect'):
+            engine.connect('started-word', self._on_word)
+        return engine
+    
+    def _on_word(self, name, location, length):
+        """Engine callback before each word: stop if speech was cancelled"""
+        # Renders are silent, so a cancel must not cut them (and the cache) short
+        if self._stop_playback.is_set() and not self._rendering:
+            self.engine.stop()
+    
+    def _run_worker(self):
+        """Speech worker: owns the engine and speaks queued items in order"""
+        try:
+            self.engine = self._init_engine()
+        except Exception as e:
+            self._init_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        
+        while True:
+            # Render cache entries only while nothing is waiting to be spoken
+            try:
+                item = self.queue.get(timeout=0.05 if self._render_backlog else 0.5)
+            except queue.Empty:
+                if self._render_backlog:
+                    self._render_next()
+                continue
+            
+            if item is _STOP:
+                break
+            
+            try:
+                # Items queued before a cancel() are skipped
+                if item.generation == self._generation:
+                    self._current = item
+                    self._stop_playback.clear()
+                    self._speak_now(item.text)
+            except Exception as e:
+                logger.error(f"Error in text-to-speech: {e}")
+            finally:
+                self._current = None
+                self._finish(item)
+        
+        self.player.close()
+    
+    def _cache_key(self, text):
+        """Cache key for text in the current voice settings"""
+        return cache_key(text, self.voice_id, self.rate, self.volume)
+    
+    def _speak_now(self, text):
+        """Speak text on the worker, from the audio cache when possible"""
+        if self.audio_cache is not None:
+            key = self._cache_key(text)
+            path = self.audio_cache.get(key)
+            if path and self.player.play(path, self._stop_playback):
+                return
+            
+            # Frequently spoken text gets rendered to the cache when idle
+            uses = self._use_counts.get(text, 0) + 1
+            if len(self._use_counts) > 1000:
+                self._use_counts.clear()
+            self._use_counts[text] = uses
+            if uses == config.TTS_CACHE_MIN_USES:
+                self._render_backlog.append(text)
+        
+        self.engine.say(text)
+        self.engine.runAndWait()
+    
+    def _render_next(self):
+        """Render one backlog entry to the audio cache"""
+        text = self._render_backlog.popleft()
+        key = self._cache_key(text)
+        if key in self.audio_cache:
+            return
+        
+        path = self.audio_cache.reserve(key)
+        self._rendering = True
+        try:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+            self.audio_cache.commit(key, path)
+        except Exception as e:
+            logger.warning(f"Could not pre-render speech: {e}")
+        finally:
+            self._rendering = False
+    
+    def prewarm(self, phrases):
+        """
+        Render phrases to the audio cache in the background
+        
+        Rendering happens on the speech worker whenever no speech is
+        queued, so startup is not delayed.
+        
+        Args:
+            phrases: Texts that will be spoken often
+        """
+        if self.audio_cache is None:
+            return
+        for text in phrases:
+            if text and text.strip():
+                self._render_backlog.append(text)
+    
+    def _finish(self, item):
+        """Mark a queued item as done"""
+        item.done.set()
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+    
+    def _enqueue(self, text, block=True, generation=None):
+        """Queue text for the worker, returning the queued item or None"""
+        item = _SpeechItem(text, self._generation if generation is None else generation)
+        with self._idle:
+            self._pending += 1
+        try:
+            self.queue.put(item, block=block)
+        except queue.Full:
+            self._finish(item)
+            return None
+        return item
     
     def speak(self, text):
         """
-        Convert text to speech
+        Convert text to speech, waiting until it has been spoken
         
         Args:
             text: Text to be spoken
         """
-        try:
-            print(f"🔊 Speaking: {text}")
-            self.engine.say(text)
-            self.engine.runAndWait()
-        except Exception as e:
-            logger.error(f"Error in text-to-speech: {e}")
+        print(f"🔊 Speaking: {text}")
+        with span('tts', chars=len(text)):
+            item = self._enqueue(text)
+            item.done.wait()
     
     def speak_async(self, text):
-        """Non-blocking text to speech (for faster response)"""
+        """
+        Non-blocking text to speech (for faster response)
+        
+        Args:
+            text: Text to be spoken
+        
+        Returns:
+            True if queued, False if the speech queue is full
+        """
+        print(f"🔊 Speaking: {text}")
+        if self._enqueue(text, block=False) is None:
+            logger.warning("Speech queue full, dropping utterance")
+            return False
+        return True
+    
+    def speak_stream(self, fragments, wait=True):
+        """
+        Speak streamed text sentence by sentence
+        
+        Each sentence is queued as soon as it is complete, so speech
+        starts before the whole response has been generated and the
+        rest of the response keeps streaming while it plays. A cancel()
+        (e.g. barge-in) ends the stream: nothing more is queued and no
+        more fragments are read.
+        
+        Args:
+            fragments: Iterable of text fragments (e.g. streamed tokens)
+            wait: Wait until everything has been spoken
+        
+        Returns:
+            The text that was queued for speaking
+        """
+        generation = self._generation
+        sentences = []
+        stream = split_sentences(fragments)
         try:
-            self.engine.say(text)
-            self.engine.runAndWait()
-        except Exception as e:
-            logger.error(f"Error in async speech: {e}")
+            for sentence in stream:
+                if self._generation != generation:
+                    break
+                sentences.append(sentence)
+                print(f"🔊 Speaking: {sentence}")
+                # Tagged with the stream's generation, so a cancel() racing
+                # with this call still drops the sentence
+                self._enqueue(sentence, generation=generation)
+        finally:
+            stream.close()
+            if hasattr(fragments, 'close'):
+                fragments.close()
+        if wait:
+            self.wait_until_idle()
+        return ' '.join(sentences)
+    
+    def flush(self):
+        """Drop queued utterances that have not started yet"""
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Keep shutdown requests in the queue
+                self.queue.put(item)
+                break
+            self._finish(item)
+    
+    def cancel(self):
+        """
+        Stop the current utterance and drop everything queued
+        
+        Cached audio stops within one playback chunk and engine speech at
+        the next word. The engine is only ever stopped from its own word
+        callback on the worker (pyttsx3 is not thread-safe), so this is safe
+        to call from any thread, e.g. for barge-in.
+        """
+        self._generation += 1
+        self.flush()
+        self._stop_playback.set()
+    
+    def wait_until_idle(self, timeout=None):
+        """
+        Block until all queued speech has finished
+        
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+        
+        Returns:
+            True if idle, False if the timeout expired
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+    
+    @property
+    def is_speaking(self):
+        """Whether speech is playing or queued"""
+        return self._pending > 0
+    
+    def close(self, timeout=None):
+        """Finish queued speech and stop the worker"""
+        self.queue.put(_STOP)
+        self._worker.join(timeout)
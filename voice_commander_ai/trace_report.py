@@ -0,0 +1,111 @@
+"""
+Trace Report
+Per-stage latency percentiles from the JSONL trace files written by tracing.py
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+from collections import defaultdict
+
+import config
+
+PERCENTILES = (50, 90, 99)
+
+
+def trace_files(path: str) -> list:
+    """The trace file and its rotated backups, oldest first"""
+    rotated = sorted(glob.glob(f"{glob.escape(path)}.*"),
+                     key=lambda name: int(name.rsplit('.', 1)[1]) if name.rsplit('.', 1)[1].isdigit() else 0,
+                     reverse=True)
+    return rotated + ([path] if os.path.exists(path) else [])
+
+
+def load_traces(paths: list) -> list:
+    """Read traces, skipping lines cut short by a crash"""
+    traces = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    traces.append(json.loads(line))
+                except ValueError:
+                    continue
+    return traces
+
+
+def percentile(values: list, p: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def summarize(traces: list) -> dict:
+    """
+    Latency percentiles per span name
+    
+    Args:
+        traces: Trace records
+    
+    Returns:
+        Mapping of stage name to count, mean, percentiles and max (ms);
+        the whole utterance is reported as 'total'
+    """
+    durations = defaultdict(list)
+    for trace in traces:
+        durations['total'].append(trace['duration_ms'])
+        for span in trace.get('spans', []):
+            durations[span['name']].append(span['duration_ms'])
+    
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        summary[name] = {
+            'count': len(values),
+            'mean_ms': sum(values) / len(values),
+            **{f"p{p}_ms": percentile(values, p) for p in PERCENTILES},
+            'max_ms': values[-1],
+        }
+    return summary
+
+
+def print_summary(summary: dict, trace_count: int):
+    """Print the per-stage table, slowest median first"""
+    print("\n" + "="*80)
+    print(f"⏱️  LATENCY BY STAGE ({trace_count} utterances)")
+    print("="*80)
+    header = ''.join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+    print(f"{'Stage':<24}{'count':>8}{'mean ms':>10}{header}{'max ms':>10}")
+    for name, stats in sorted(summary.items(), key=lambda item: -item[1]['p50_ms']):
+        row = ''.join(f"{stats[f'p{p}_ms']:>10.1f}" for p in PERCENTILES)
+        print(f"{name:<24}{stats['count']:>8}{stats['mean_ms']:>10.1f}{row}{stats['max_ms']:>10.1f}")
+    print("="*80 + "\n")
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Summarize Voice Commander AI latency traces")
+    parser.add_argument('paths', nargs='*',
+                        help=f"trace files (default: {config.TRACE_FILE} and its rotated backups)")
+    parser.add_argument('--status', help="only include traces with this status (e.g. spoken)")
+    parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    args = parser.parse_args(argv)
+    
+    traces = load_traces(args.paths or trace_files(config.TRACE_FILE))
+    if args.status:
+        traces = [trace for trace in traces if trace.get('attrs', {}).get('status') == args.status]
+    if not traces:
+        print("No traces found")
+        return 1
+    
+    summary = summarize(traces)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary, len(traces))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Tracing Module
+Per-utterance latency spans written to a rotating JSONL trace file
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import contextvars
+import logging.handlers
+from contextlib import contextmanager
+from typing import Optional
+
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('voice_commander_trace', default=None)
+
+
+class Trace:
+    """
+    Timing record of one utterance
+    
+    Spans are measured with the monotonic perf_counter clock and stored
+    as offsets from the start of the trace, so they line up across
+    threads and stages.
+    """
+    
+    def __init__(self, tracer: 'Tracer', **attrs):
+        self.tracer = tracer
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.attrs = attrs
+        self.started = time.time()
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.finished = False
+    
+    def add_span(self, name: str, start: float, end: float, **attrs):
+        """
+        Record a span from perf_counter timestamps
+        
+        Args:
+            name: Stage name
+            start: perf_counter() at the start
+            end: perf_counter() at the end
+            attrs: Extra fields stored with the span
+        """
+        record = {
+            'name': name,
+            'start_ms': round((start - self.origin) * 1000, 3),
+            'duration_ms': round((end - start) * 1000, 3),
+        }
+        if attrs:
+            record['attrs'] = attrs
+        self.spans.append(record)
+    
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time the enclosed block as a span"""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_span(name, start, time.perf_counter(), **attrs)
+    
+    @contextmanager
+    def activate(self):
+        """Make this the current trace for span() calls in this thread"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+    
+    def finish(self, **attrs):
+        """Write the trace (only the first call has an effect)"""
+        if self.finished:
+            return
+        self.finished = True
+        self.attrs.update(attrs)
+        self.tracer.write({
+            'trace_id': self.trace_id,
+            'start': self.started,
+            'duration_ms': round((time.perf_counter() - self.origin) * 1000, 3),
+            'attrs': self.attrs,
+            'spans': self.spans,
+        })
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace active in this thread, if any"""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Time a block as a span of the current trace
+    
+    Does nothing when no trace is active, so library code can be
+    instrumented without depending on the application tracing.
+    
+    Args:
+        name: Stage name
+        attrs: Extra fields stored with the span
+    """
+    trace = _current.get()
+    if trace is None:
+        yield None
+        return
+    with trace.span(name, **attrs):
+        yield trace
+
+
+class Tracer:
+    """Creates traces and appends finished ones to a rotating JSONL file"""
+    
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None,
+                 backup_count: Optional[int] = None):
+        """
+        Initialize the tracer
+        
+        Args:
+            path: Trace file (default: config.TRACE_FILE)
+            max_bytes: Size at which the file is rotated (default: config.TRACE_MAX_BYTES)
+            backup_count: Rotated files kept (default: config.TRACE_BACKUP_COUNT)
+        """
+        self.path = path or config.TRACE_FILE
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        
+        handler = logging.handlers.RotatingFileHandler(
+            self.path,
+            maxBytes=config.TRACE_MAX_BYTES if max_bytes is None else max_bytes,
+            backupCount=config.TRACE_BACKUP_COUNT if backup_count is None else backup_count,
+            encoding='utf-8',
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._log = logging.getLogger(f"{__name__}.file.{id(self)}")
+        self._log.setLevel(logging.INFO)
+        self._log.propagate = False
+        self._log.addHandler(handler)
+        self._handler = handler
+    
+    def start(self, **attrs) -> Trace:
+        """Start a trace for a new utterance"""
+        return Trace(self, **attrs)
+    
+    @contextmanager
+    def trace(self, **attrs):
+        """Start, activate and finish a trace around a block"""
+        trace = self.start(**attrs)
+        try:
+            with trace.activate():
+                yield trace
+        finally:
+            trace.finish()
+    
+    def write(self, record: dict):
+        """Append a finished trace to the file"""
+        self._log.info(json.dumps(record))
+    
+    def close(self):
+        """Flush and close the trace file"""
+        self._log.removeHandler(self._handler)
+        self._handler.close()
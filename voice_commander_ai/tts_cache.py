@@ -0,0 +1,191 @@
+"""
+TTS Cache Module
+Content-addressed on-disk cache of rendered speech audio
+"""
+
+import os
+import wave
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Frames read per chunk while playing, small enough to stop quickly
+PLAYBACK_CHUNK_FRAMES = 1024
+
+
+def cache_key(text: str, voice, rate, volume) -> str:
+    """
+    Build the cache key for a rendered utterance
+    
+    Args:
+        text: Spoken text
+        voice: Voice id
+        rate: Speech rate
+        volume: Volume level
+    
+    Returns:
+        Hex digest identifying the audio
+    """
+    payload = '\x1f'.join(str(part) for part in (text, voice, rate, volume))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """Directory of rendered WAV files with size-based LRU eviction"""
+    
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initialize the cache
+        
+        Args:
+            directory: Directory holding the audio files
+            max_bytes: Total size above which the least recently used files are removed
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+    
+    def path_for(self, key: str) -> str:
+        """File path for a cache key"""
+        return os.path.join(self.directory, f"{key}.wav")
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up rendered audio
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Path of the audio file, or None on a miss
+        """
+        path = self.path_for(key)
+        try:
+            # Touch the file so eviction sees it as recently used
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+    
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self.path_for(key))
+    
+    def reserve(self, key: str) -> str:
+        """Temporary path to render into before calling commit()"""
+        handle, path = tempfile.mkstemp(suffix='.wav', prefix=f".{key[:16]}-", dir=self.directory)
+        os.close(handle)
+        return path
+    
+    def commit(self, key: str, rendered_path: str) -> bool:
+        """
+        Move a rendered file into the cache
+        
+        Args:
+            key: Cache key
+            rendered_path: Path returned by reserve()
+        
+        Returns:
+            True if the file was stored
+        """
+        try:
+            if os.path.getsize(rendered_path) == 0:
+                os.remove(rendered_path)
+                return False
+            os.replace(rendered_path, self.path_for(key))
+        except OSError as e:
+            logger.warning(f"Could not store rendered speech: {e}")
+            return False
+        self.evict()
+        return True
+    
+    def evict(self):
+        """Remove least recently used files until the cache fits its size limit"""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith('.wav') and not entry.name.startswith('.'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+    
+    def stats(self) -> dict:
+        """Hit/miss counters"""
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+class WavPlayer:
+    """Plays WAV files through PyAudio, keeping one PyAudio instance open"""
+    
+    def __init__(self):
+        self._audio = None
+        self.available = True
+    
+    def play(self, path: str, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Play a WAV file, stopping early if stop_event is set
+        
+        Args:
+            path: WAV file path
+            stop_event: Event that interrupts playback when set
+        
+        Returns:
+            True if the file was played (or interrupted), False if playback failed
+        """
+        if not self.available:
+            return False
+        
+        if self._audio is None:
+            try:
+                import pyaudio
+                self._audio = pyaudio.PyAudio()
+            except (ImportError, OSError) as e:
+                logger.warning(f"Cached speech playback unavailable: {e}")
+                self.available = False
+                return False
+        
+        try:
+            with wave.open(path, 'rb') as wav:
+                stream = self._audio.open(
+                    format=self._audio.get_format_from_width(wav.getsampwidth()),
+                    channels=wav.getnchannels(),
+                    rate=wav.getframerate(),
+                    output=True,
+                )
+                try:
+                    data = wav.readframes(PLAYBACK_CHUNK_FRAMES)
+                    while data and not (stop_event and stop_event.is_set()):
+                        stream.write(data)
+                        data = wav.readframes(PLAYBACK_CHUNK_FRAMES)
+                finally:
+                    stream.stop_stream()
+                    stream.close()
+        except (OSError, EOFError, wave.Error) as e:
+            logger.warning(f"Could not play cached speech {path}: {e}")
+            return False
+        return True
+    
+    def close(self):
+        """Release the audio device"""
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
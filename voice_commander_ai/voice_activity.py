@@ -0,0 +1,264 @@
+"""
+Voice Activity Detection Module
+Trims silence and non-speech from captured phrases before recognition
+"""
+
+import math
+import logging
+from array import array
+from typing import List, Optional, Tuple
+
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import audioop
+except ImportError:
+    audioop = None
+
+# Frames with more zero crossings than this are treated as noise unless they are loud
+MAX_SPEECH_ZCR = 0.35
+
+# Voiced speech this many times above the threshold is kept whatever its zero-crossing rate
+LOUD_FACTOR = 3.0
+
+# Multiple of the noise floor used when no energy threshold is given
+NOISE_FLOOR_RATIO = 3.0
+
+
+class VadStats:
+    """Running totals of how much audio the detector removed"""
+    
+    def __init__(self):
+        self.phrases = 0
+        self.dropped_phrases = 0
+        self.segments = 0
+        self.input_seconds = 0.0
+        self.output_seconds = 0.0
+    
+    @property
+    def saved_seconds(self) -> float:
+        return self.input_seconds - self.output_seconds
+    
+    @property
+    def saved_ratio(self) -> float:
+        """Fraction of the captured audio that was not sent for recognition"""
+        return self.saved_seconds / self.input_seconds if self.input_seconds else 0.0
+    
+    def as_dict(self) -> dict:
+        return {
+            'phrases': self.phrases,
+            'dropped_phrases': self.dropped_phrases,
+            'segments': self.segments,
+            'input_seconds': round(self.input_seconds, 3),
+            'output_seconds': round(self.output_seconds, 3),
+            'saved_ratio': round(self.saved_ratio, 4),
+        }
+
+
+class VoiceActivityDetector:
+    """
+    Energy and zero-crossing voice activity detector
+    
+    Audio is cut into fixed frames and the RMS energy and zero-crossing
+    rate of every frame are computed at once with NumPy. Frames that are
+    loud enough (and not noise-like) count as speech; speech runs are
+    padded, split where the pause is long, and runs too short to be a
+    word are dropped.
+    """
+    
+    def __init__(self, frame_ms: int = 30, pause_seconds: Optional[float] = None,
+                 min_speech_seconds: Optional[float] = None, padding_seconds: Optional[float] = None):
+        """
+        Initialize the detector
+        
+        Args:
+            frame_ms: Analysis frame length in milliseconds
+            pause_seconds: Silence that splits a phrase (default: config.VAD_PAUSE_SECONDS)
+            min_speech_seconds: Shorter segments are dropped (default: config.VAD_MIN_SPEECH_SECONDS)
+            padding_seconds: Audio kept around each segment (default: config.VAD_PADDING_SECONDS)
+        """
+        self.frame_ms = frame_ms
+        self.pause_seconds = config.VAD_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+        self.min_speech_seconds = config.VAD_MIN_SPEECH_SECONDS if min_speech_seconds is None else min_speech_seconds
+        self.padding_seconds = config.VAD_PADDING_SECONDS if padding_seconds is None else padding_seconds
+        self.stats = VadStats()
+        if np is None:
+            logger.warning("NumPy is not installed; voice activity detection is disabled")
+    
+    @property
+    def available(self) -> bool:
+        return np is not None
+    
+    def speech_frames(self, samples, sample_rate: int, energy_threshold: Optional[float] = None):
+        """
+        Classify frames as speech or not
+        
+        Args:
+            samples: 1-D int16 array
+            sample_rate: Samples per second
+            energy_threshold: RMS level of speech (default: estimated from the noise floor)
+        
+        Returns:
+            (boolean speech mask per frame, samples per frame)
+        """
+        frame_length = max(1, sample_rate * self.frame_ms // 1000)
+        count = len(samples) // frame_length
+        if count == 0:
+            return np.zeros(0, dtype=bool), frame_length
+        
+        frames = samples[:count * frame_length].reshape(count, frame_length).astype(np.float32)
+        energy = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_length
+        
+        if energy_threshold is None:
+            energy_threshold = max(np.percentile(energy, 10) * NOISE_FLOOR_RATIO, 1.0)
+        
+        loud = energy > energy_threshold
+        return loud & ((zcr < MAX_SPEECH_ZCR) | (energy > energy_threshold * LOUD_FACTOR)), frame_length
+    
+    def segments(self, raw_data: bytes, sample_rate: int,
+                 energy_threshold: Optional[float] = None) -> List[Tuple[int, int]]:
+        """
+        Find speech segments in 16-bit mono PCM
+        
+        Args:
+            raw_data: Little-endian 16-bit samples
+            sample_rate: Samples per second
+            energy_threshold: RMS level of speech (default: estimated)
+        
+        Returns:
+            (start, end) byte offsets of each speech segment
+        """
+        samples = np.frombuffer(raw_data, dtype='<i2')
+        speech, frame_length = self.speech_frames(samples, sample_rate, energy_threshold)
+        if not speech.any():
+            return []
+        
+        frame_seconds = frame_length / sample_rate
+        pause_frames = max(1, round(self.pause_seconds / frame_seconds))
+        min_frames = max(1, round(self.min_speech_seconds / frame_seconds))
+        pad_frames = round(self.padding_seconds / frame_seconds)
+        
+        # Run boundaries of the speech mask: starts at +1 steps, ends at -1 steps
+        edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        
+        # Join runs separated by less than a long pause
+        keep = np.concatenate(([True], starts[1:] - ends[:-1] >= pause_frames))
+        starts = starts[keep]
+        ends = ends[np.concatenate((keep[1:], [True]))]
+        
+        long_enough = ends - starts >= min_frames
+        starts = np.maximum(starts[long_enough] - pad_frames, 0)
+        ends = np.minimum(ends[long_enough] + pad_frames, len(speech))
+        
+        bytes_per_frame = frame_length * 2
+        return [(int(start) * bytes_per_frame, int(end) * bytes_per_frame) for start, end in zip(starts, ends)]
+    
+    def process(self, audio, energy_threshold: Optional[float] = None) -> list:
+        """
+        Cut a captured phrase down to its speech
+        
+        Args:
+            audio: speech_recognition AudioData
+            energy_threshold: RMS level of speech, e.g. the recognizer's
+                calibrated energy_threshold (default: estimated)
+        
+        Returns:
+            List of AudioData segments, empty if the phrase had no speech
+            (the input is returned unchanged when NumPy is missing)
+        """
+        if np is None:
+            return [audio]
+        
+        raw = audio.get_raw_data(convert_width=2)
+        rate = audio.sample_rate
+        found = self.segments(raw, rate, energy_threshold)
+        
+        kept_bytes = sum(end - start for start, end in found)
+        self.stats.phrases += 1
+        self.stats.segments += len(found)
+        self.stats.input_seconds += len(raw) / (2 * rate)
+        self.stats.output_seconds += kept_bytes / (2 * rate)
+        if not found:
+            self.stats.dropped_phrases += 1
+        
+        return [type(audio)(raw[start:end], rate, 2) for start, end in found]
+
+
+def chunk_rms(data: bytes, sample_width: int = 2) -> float:
+    """RMS level of a PCM chunk, on the same scale as Recognizer.energy_threshold"""
+    if audioop is not None:
+        return audioop.rms(data, sample_width)
+    samples = array('h', data[:len(data) - len(data) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+class SpeechOnsetDetector:
+    """
+    Detects the start of speech in a live stream of audio chunks
+    
+    Unlike the phrase-level detector above, this one sees audio while it
+    is being captured, so it can react (e.g. stop speech output) long
+    before the phrase ends. Onset fires once when the level has stayed
+    above the threshold for min_seconds, and re-arms after release_seconds
+    of quiet.
+    """
+    
+    def __init__(self, min_seconds: Optional[float] = None, release_seconds: float = 0.3):
+        """
+        Initialize the detector
+        
+        Args:
+            min_seconds: Sustained loudness that counts as speech (default: config.BARGE_IN_MIN_SPEECH_SECONDS)
+            release_seconds: Quiet needed before the next onset can fire
+        """
+        self.min_seconds = config.BARGE_IN_MIN_SPEECH_SECONDS if min_seconds is None else min_seconds
+        self.release_seconds = release_seconds
+        self._loud = 0.0
+        self._quiet = 0.0
+        self._fired = False
+    
+    def reset(self):
+        self._loud = 0.0
+        self._quiet = 0.0
+        self._fired = False
+    
+    def feed(self, data: bytes, threshold: float, sample_rate: int, sample_width: int = 2) -> bool:
+        """
+        Process one captured chunk
+        
+        Args:
+            data: PCM chunk
+            threshold: RMS level that counts as speech
+            sample_rate: Samples per second
+            sample_width: Bytes per sample
+        
+        Returns:
+            True on the chunk where speech onset is detected
+        """
+        seconds = len(data) / (sample_rate * sample_width)
+        if chunk_rms(data, sample_width) > threshold:
+            self._loud += seconds
+            self._quiet = 0.0
+            if not self._fired and self._loud >= self.min_seconds:
+                self._fired = True
+                return True
+        else:
+            self._quiet += seconds
+            if self._quiet >= self.release_seconds:
+                self._loud = 0.0
+                self._fired = False
+        return False
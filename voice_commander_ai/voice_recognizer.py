@@ -1,57 +1,345 @@
 """
 Voice Recognition Module
-Handles speech-to-text conversion using Google Speech Recognition
+Handles speech-to-text conversion with a configurable recognition backend
 """
 
+import time
+import queue
 import speech_recognition as sr
-import pyttsx3
 import logging
 
+import config
+from speech_backends import create_backend
+from noise_calibration import CalibrationStore, apply_calibration
+from voice_activity import SpeechOnsetDetector, VoiceActivityDetector
+from tracing import span
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class _TappedStream:
+    """Microphone stream wrapper that shows every chunk read to a callback"""
+    
+    def __init__(self, stream, on_chunk):
+        self._stream = stream
+        self._on_chunk = on_chunk
+    
+    def read(self, size):
+        data = self._stream.read(size)
+        self._on_chunk(data)
+        return data
+    
+    def close(self):
+        self._stream.close()
+
+
+class TappedMicrophone(sr.Microphone):
+    """Microphone that lets the application watch raw audio while it is captured"""
+    
+    def __init__(self, device_index=None, on_chunk=None):
+        super().__init__(device_index=device_index)
+        self.on_chunk = on_chunk
+    
+    def __enter__(self):
+        source = super().__enter__()
+        if self.on_chunk is not None:
+            self.stream = _TappedStream(self.stream, self.on_chunk)
+        return source
+
+
 class VoiceRecognizer:
     """Handles voice input recognition"""
     
-    def __init__(self):
+    def __init__(self, persistent=None, queue_size=None, backend=None):
+        """
+        Initialize the recognizer
+        
+        Args:
+            persistent: Keep the microphone stream open and capture phrases
+                in the background (default: config.PERSISTENT_MIC_STREAM)
+            queue_size: Maximum captured phrases waiting to be recognized
+                (default: config.PHRASE_QUEUE_SIZE)
+            backend: Speech backend name or instance (default: config.STT_BACKEND)
+        """
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.backend = create_backend(backend) if backend is None or isinstance(backend, str) else backend
+        self.device_index = config.MICROPHONE_INDEX
+        self.microphone = TappedMicrophone(device_index=self.device_index, on_chunk=self._on_chunk)
+        self.persistent = config.PERSISTENT_MIC_STREAM if persistent is None else persistent
+        self.phrases = queue.Queue(maxsize=queue_size or config.PHRASE_QUEUE_SIZE)
+        self.dropped_phrases = 0
+        self._stop_listening = None
+        self.calibration_store = CalibrationStore(config.NOISE_CALIBRATION_FILE, config.NOISE_CALIBRATION_MAX_AGE)
+        self._last_saved = 0.0
+        self.vad = VoiceActivityDetector() if config.VAD_ENABLED else None
+        
+        # Barge-in: called on the capture thread as soon as speech starts
+        self.on_speech_start = None
+        self.onset = SpeechOnsetDetector()
+        
+        # Echo guard: tells whether speech output is playing; phrases that
+        # overlap playback are dropped unless speech onset fired during them
+        self.is_playing = None
+        self.echo_phrases = 0
+        self._playback_heard_at = float('-inf')
+        self._onset_at = float('-inf')
+        
+        # Load offline models up front instead of on the first command
+        self.backend.load()
+        
+        # Reuse this microphone's saved sensitivity; calibrate only the first time
+        self.recognizer.dynamic_energy_threshold = True
+        saved = self.calibration_store.load(self.device_index)
+        if saved:
+            apply_calibration(self.recognizer, saved)
+            self._last_saved = time.monotonic()
+            logger.info(f"Using saved energy threshold {self.recognizer.energy_threshold:.0f}")
+        else:
+            self.calibrate()
         
-        # Adjust microphone sensitivity
+        if self.persistent:
+            self.start()
+    
+    def calibrate(self, duration=None):
+        """
+        Measure the ambient noise level and save it for this microphone
+        
+        Args:
+            duration: Seconds to sample (default: config.AMBIENT_NOISE_DURATION)
+        """
         with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            self.recognizer.adjust_for_ambient_noise(source, duration=duration or config.AMBIENT_NOISE_DURATION)
+        logger.info(f"Calibrated energy threshold {self.recognizer.energy_threshold:.0f}")
+        self.save_calibration()
     
-    def listen(self, timeout=10, phrase_time_limit=15):
+    def save_calibration(self):
+        """Persist the current (adapted) energy threshold for this microphone"""
+        self.calibration_store.save(self.device_index, self.recognizer)
+        self._last_saved = time.monotonic()
+    
+    def _maybe_save_calibration(self):
+        """Persist the adapted threshold at most once per save interval"""
+        if time.monotonic() - self._last_saved >= config.NOISE_CALIBRATION_SAVE_INTERVAL:
+            self.save_calibration()
+    
+    def _on_chunk(self, data):
+        """Watch captured audio for playback and speech onset (called on the capture thread)"""
+        if self.is_playing is not None and self.is_playing():
+            self._playback_heard_at = time.perf_counter()
+        if self.on_speech_start is None:
+            return
+        # The assistant's own voice reaches the microphone too, so interrupting
+        # takes speech clearly louder than the usual threshold
+        threshold = self.recognizer.energy_threshold * config.BARGE_IN_ENERGY_FACTOR
+        if self.onset.feed(data, threshold, self.microphone.SAMPLE_RATE, self.microphone.SAMPLE_WIDTH):
+            self._onset_at = time.perf_counter()
+            try:
+                self.on_speech_start()
+            except Exception as e:
+                logger.error(f"Error in speech onset handler: {e}")
+    
+    def start(self, phrase_time_limit=None):
         """
-        Listen for voice input from user
+        Open the microphone once and capture phrases in the background
+        
+        A background thread keeps the stream open, splits the audio into
+        phrases and queues them, so nothing said between turns is lost and
+        listen() no longer pays for reopening the device.
+        
+        Args:
+            phrase_time_limit: Maximum duration of speech (default: config.PHRASE_TIME_LIMIT)
+        """
+        if self._stop_listening is not None:
+            return
+        self._stop_listening = self.recognizer.listen_in_background(
+            self.microphone,
+            self._on_phrase,
+            phrase_time_limit=phrase_time_limit or config.PHRASE_TIME_LIMIT,
+        )
+        logger.info("Background listener started")
+    
+    def stop(self):
+        """Stop the background listener and close the microphone stream"""
+        if self._stop_listening is not None:
+            self._stop_listening(wait_for_stop=False)
+            self._stop_listening = None
+            self.save_calibration()
+            logger.info("Background listener stopped")
+        if self.vad is not None and self.vad.stats.phrases:
+            stats = self.vad.stats
+            logger.info(f"Voice activity detection skipped {stats.saved_seconds:.1f}s of "
+                        f"{stats.input_seconds:.1f}s captured ({stats.saved_ratio:.0%}), "
+                        f"{stats.dropped_phrases} phrase(s) without speech")
+    
+    @property
+    def is_listening(self):
+        """Whether the background listener is running"""
+        return self._stop_listening is not None
+    
+    def _speech_started(self, audio):
+        """
+        When the speech in a phrase that just ended began (perf_counter)
+        
+        The phrase is delivered pause_threshold after the speech stopped
+        and keeps non_speaking_duration of silence at both ends.
+        """
+        seconds = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        return (time.perf_counter() - self.recognizer.pause_threshold - seconds
+                + 2 * self.recognizer.non_speaking_duration)
+    
+    def _is_echo(self, audio):
+        """
+        Whether a phrase that just ended was heard while speech output played
+        
+        Such a phrase is most likely the assistant's own voice (reading the
+        help text aloud would otherwise say "bye" to itself), unless speech
+        onset fired during it, i.e. the user barged in.
+        """
+        if self.is_playing is None:
+            return False
+        started = self._speech_started(audio)
+        if self._playback_heard_at < started or self._onset_at >= started:
+            return False
+        self.echo_phrases += 1
+        logger.info("Ignored a phrase heard while speaking")
+        return True
+    
+    def _on_phrase(self, recognizer, audio):
+        """Queue a captured phrase (called on the listener thread)"""
+        self._maybe_save_calibration()
+        if self._is_echo(audio):
+            return
+        try:
+            self.phrases.put_nowait(audio)
+        except queue.Full:
+            # Keep the newest speech; the oldest phrase is the least relevant
+            try:
+                self.phrases.get_nowait()
+                self.dropped_phrases += 1
+            except queue.Empty:
+                pass
+            try:
+                self.phrases.put_nowait(audio)
+            except queue.Full:
+                self.dropped_phrases += 1
+    
+    def capture(self, timeout=10, phrase_time_limit=15):
+        """
+        Capture one phrase of audio
         
         Args:
             timeout: Maximum time to wait for speech
-            phrase_time_limit: Maximum duration of speech
-            
+            phrase_time_limit: Maximum duration of speech (ignored while the
+                background listener is running; it uses its own limit)
+        
+        Returns:
+            AudioData
+        
+        Raises:
+            sr.WaitTimeoutError: No speech within the timeout (or only speech output was heard)
+        """
+        if self.is_listening:
+            try:
+                return self.phrases.get(timeout=timeout)
+            except queue.Empty:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+        
+        with self.microphone as source:
+            audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+        self._maybe_save_calibration()
+        if self._is_echo(audio):
+            raise sr.WaitTimeoutError("only speech output was heard")
+        return audio
+    
+    def recognize(self, audio):
+        """
+        Convert captured audio to text
+        
+        With voice activity detection enabled, silence is trimmed first,
+        phrases are split on long pauses, and audio without speech never
+        reaches the recognition backend.
+        
+        Args:
+            audio: AudioData
+        
+        Returns:
+            Recognized text (lowercase)
+        """
+        segments = [audio]
+        if self.vad is not None:
+            with span('vad'):
+                segments = self.vad.process(audio, self.recognizer.energy_threshold)
+            if not segments:
+                raise sr.UnknownValueError()
+        
+        print("⏳ Processing audio...")
+        texts = []
+        for segment in segments:
+            try:
+                with span('stt', backend=self.backend.name):
+                    texts.append(self.backend.recognize(self.recognizer, segment))
+            except sr.UnknownValueError:
+                continue
+        if not texts:
+            raise sr.UnknownValueError()
+        text = ' '.join(texts)
+        print(f"✅ You said: {text}")
+        return text.lower()
+    
+    def poll(self, timeout=1):
+        """
+        Capture a phrase if one arrives within the timeout
+        
+        Args:
+            timeout: Seconds to wait for speech
+        
+        Returns:
+            AudioData or None
+        """
+        try:
+            return self.capture(timeout=timeout, phrase_time_limit=config.PHRASE_TIME_LIMIT)
+        except sr.WaitTimeoutError:
+            return None
+    
+    def transcribe(self, audio):
+        """
+        Recognize captured audio, logging failures instead of raising
+        
+        Args:
+            audio: AudioData
+        
         Returns:
             Recognized text or None if failed
         """
         try:
-            with self.microphone as source:
-                print("🎤 Listening...")
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
-            
-            print("⏳ Processing audio...")
-            text = self.recognizer.recognize_google(audio)
-            print(f"✅ You said: {text}")
-            return text.lower()
-            
+            return self.recognize(audio)
         except sr.UnknownValueError:
             logger.warning("Could not understand audio")
             return None
         except sr.RequestError as e:
-            logger.error(f"Error accessing Google Speech Recognition: {e}")
+            logger.error(f"Error accessing {self.backend.name} speech recognition: {e}")
             return None
+    
+    def listen(self, timeout=10, phrase_time_limit=15):
+        """
+        Listen for voice input from user
+        
+        Args:
+            timeout: Maximum time to wait for speech
+            phrase_time_limit: Maximum duration of speech
+            
+        Returns:
+            Recognized text or None if failed
+        """
+        try:
+            print("🎤 Listening...")
+            with span('capture'):
+                audio = self.capture(timeout=timeout, phrase_time_limit=phrase_time_limit)
         except sr.WaitTimeoutError:
             logger.warning("No speech detected within timeout")
             return None
+        return self.transcribe(audio)
     
     def listen_continuous(self):
         """Listen for continuous voice commands"""